@@ -15,6 +15,11 @@ from typing import Dict, List, Tuple, Any, Callable
 from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; fall back to the statistics module
+    np = None
+
 
 @dataclass
 class BenchmarkResult:
@@ -66,29 +71,48 @@ class BenchmarkSuite:
         Returns:
             BenchmarkResult with timing statistics
         """
-        times: List[float] = []
+        # Raw timings in integer nanoseconds; converted to seconds for reporting
+        times: List[int] = []
 
         print(f"\n⏱️  Running benchmark: {name}")
         print(f"   Iterations: {iterations}")
 
+        perf_counter_ns = time.perf_counter_ns
         for i in range(iterations):
-            start: float = time.time()
+            start: int = perf_counter_ns()
             try:
                 func()
             except Exception as e:
                 print(f"   ⚠️  Error in iteration {i + 1}: {e}")
                 continue
-            end: float = time.time()
+            end: int = perf_counter_ns()
             times.append(end - start)
-            print(f"   [{i + 1}/{iterations}] {times[-1]:.3f}s")
+            # Report progress every 64 iterations so stdout I/O stays out of the timings
+            if (i & 63) == 0 or i == iterations - 1:
+                print(f"   [{i + 1}/{iterations}] {times[-1] / 1e9:.3f}s")
 
         # Calculate statistics
-        total_time: float = sum(times)
-        min_time: float = min(times) if times else 0
-        max_time: float = max(times) if times else 0
-        avg_time: float = statistics.mean(times) if times else 0
-        median_time: float = statistics.median(times) if times else 0
-        std_dev: float = statistics.stdev(times) if len(times) > 1 else 0
+        total_time: float
+        min_time: float
+        max_time: float
+        avg_time: float
+        median_time: float
+        std_dev: float
+        if np is not None and times:
+            arr = np.fromiter(times, dtype=np.float64, count=len(times)) / 1e9
+            total_time = float(arr.sum())
+            min_time = float(arr.min())
+            max_time = float(arr.max())
+            avg_time = float(arr.mean())
+            median_time = float(np.median(arr))
+            std_dev = float(arr.std(ddof=1)) if len(arr) > 1 else 0
+        else:
+            total_time = sum(times) / 1e9
+            min_time = min(times) / 1e9 if times else 0
+            max_time = max(times) / 1e9 if times else 0
+            avg_time = statistics.mean(times) / 1e9 if times else 0
+            median_time = statistics.median(times) / 1e9 if times else 0
+            std_dev = statistics.stdev(times) / 1e9 if len(times) > 1 else 0
 
         result: BenchmarkResult = BenchmarkResult(
             name=name,
@@ -123,28 +147,68 @@ class BenchmarkSuite:
         """Export results to CSV file."""
         import csv
 
-        with open(filepath, "w", newline="") as f:
-            writer = csv.writer(f)
+        rows = [
+            (
+                result.name,
+                result.iterations,
+                f"{result.total_time:.3f}",
+                f"{result.min_time:.3f}",
+                f"{result.max_time:.3f}",
+                f"{result.avg_time:.3f}",
+                f"{result.median_time:.3f}",
+                f"{result.std_dev:.3f}",
+            )
+            for result in self.results
+        ]
+
+        with open(filepath, "w", newline="", buffering=1 << 16) as f:
+            writer = csv.writer(f, lineterminator="\n")
             writer.writerow([
                 "Name", "Iterations", "Total Time", "Min Time", "Max Time",
                 "Avg Time", "Median Time", "Std Dev"
             ])
-
-            for result in self.results:
-                writer.writerow([
-                    result.name,
-                    result.iterations,
-                    f"{result.total_time:.3f}",
-                    f"{result.min_time:.3f}",
-                    f"{result.max_time:.3f}",
-                    f"{result.avg_time:.3f}",
-                    f"{result.median_time:.3f}",
-                    f"{result.std_dev:.3f}"
-                ])
+            writer.writerows(rows)
 
         print(f"\n✅ Results exported to {filepath}")
 
 
+def deep_sizeof(obj: Any) -> int:
+    """
+    Return the size of an object including everything it references.
+
+    Walks referents iteratively, counting each object once. Classes, modules
+    and functions are skipped so shared interpreter state is not included.
+
+    Args:
+        obj: Object to measure
+
+    Returns:
+        Total size in bytes
+    """
+    import gc
+    import sys
+    import types
+
+    try:
+        from pympler.asizeof import asizeof
+        return asizeof(obj)
+    except ImportError:
+        pass
+
+    skip = (type, types.ModuleType, types.FunctionType)
+    seen: set = set()
+    size = 0
+    stack: List[Any] = [obj]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, skip) or id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        stack.extend(gc.get_referents(current))
+    return size
+
+
 def benchmark_agent_planning() -> None:
     """Benchmark agent planning performance."""
     from src.config import load_config_and_llm
@@ -209,7 +273,6 @@ def benchmark_repository_scanning() -> None:
 
 def benchmark_memory_usage() -> None:
     """Benchmark memory usage of agent components."""
-    import sys
     from src.config import load_config_and_llm
     from src.agent.planner import Planner
     from src.agent.history import ConversationHistory
@@ -226,19 +289,25 @@ def benchmark_memory_usage() -> None:
 
         # Analyze planner memory
         planner = Planner(llm)
-        planner_size = sys.getsizeof(planner)
+        planner_size = deep_sizeof(planner)
         print(f"Planner object size: {planner_size:,} bytes ({planner_size / 1024:.2f} KB)")
 
         # Analyze history memory
         history = ConversationHistory()
-        for i in range(100):
-            history.add_message("user", f"Message {i}: " + "x" * 100)
-            history.add_message("assistant", f"Response {i}: " + "y" * 200)
+        history.extend(
+            message
+            for i in range(100)
+            for message in (
+                ("user", f"Message {i}: " + "x" * 100),
+                ("assistant", f"Response {i}: " + "y" * 200),
+            )
+        )
 
-        history_size = sys.getsizeof(history)
-        print(f"History object size (100 messages): {history_size:,} bytes ({history_size / 1024:.2f} KB)")
+        message_count = len(history.messages)
+        history_size = deep_sizeof(history)
+        print(f"History object size ({message_count} messages): {history_size:,} bytes ({history_size / 1024:.2f} KB)")
 
-        avg_per_message = history_size / 200
+        avg_per_message = history_size / message_count
         print(f"Average per message: {avg_per_message:.2f} bytes")
 
     except Exception as e:
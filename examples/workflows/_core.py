@@ -0,0 +1,102 @@
+"""
+Shared workflow skeleton.
+
+Every workflow follows the same steps: load the LLM, plan the goal,
+execute the planned tasks and record the conversation. The individual
+workflow modules only add their own framing and report.
+"""
+
+import logging
+from functools import lru_cache
+
+from src.config import AgentConfig, load_config_and_llm
+from src.agent.planner import Planner
+from src.agent.executor import Executor
+from src.agent.history import ConversationHistory
+from typing import Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=8)
+def _get_executor(llm: Any, repo_path: str) -> Executor:
+    """Return one Executor per (LLM, repository) so repository scans are reused.
+
+    Bounded so a long-lived process cycling through many repositories does
+    not keep every Executor alive.
+    """
+    return Executor(llm, repo_path)
+
+
+def run_workflow(
+    goal: str,
+    *,
+    request: str,
+    steps_label: str = "tasks",
+    task_label: str = "Execute task",
+    emoji: str = "⚙️",
+    repo_path: str = ".",
+    config_file: str = "agent.config.yaml"
+) -> Dict[str, Any]:
+    """
+    Plan a goal and execute its tasks concurrently.
+
+    Args:
+        goal: Goal handed to the planner
+        request: User message recorded at the start of the conversation
+        steps_label: Name for the planned tasks in progress output
+        task_label: Prefix of the user message recorded for each task
+        emoji: Marker printed in front of each executed task
+        repo_path: Path to the repository
+        config_file: Path to configuration file
+
+    Returns:
+        Dictionary with the planned tasks, the result or exception of each
+        task keyed by task id, and the conversation history
+    """
+    config: AgentConfig
+    llm: Any
+    config, llm = load_config_and_llm(config_file)
+
+    planner: Planner = Planner(llm)
+    executor: Executor = _get_executor(llm, repo_path)
+    history: ConversationHistory = ConversationHistory()
+
+    history.add_message("user", request)
+
+    # Plan
+    logger.info("🔍 Planning %s...", steps_label)
+
+    tasks = planner.plan(goal)
+
+    logger.info("\n✅ Created %s %s:\n", len(tasks), steps_label)
+    for i, task in enumerate(tasks, 1):
+        logger.info("  %s. %s", i, task.description)
+
+    history.add_message("assistant", planner.get_plan_summary())
+
+    # Execute: tasks are independent LLM calls, so run them concurrently
+    logger.info("\n⚙️  Executing %s...\n", steps_label)
+    outcomes = executor.execute_tasks_batch(tasks)
+    results: Dict[int, Any] = {}
+    pending: List[Tuple[str, str]] = []
+
+    for task, result in zip(tasks, outcomes):
+        logger.info("%s %s", emoji, task.description)
+        results[task.id] = result
+        if isinstance(result, Exception):
+            logger.error("   ✗ Failed: %s\n", result)
+            continue
+        planner.mark_task_complete(task.id, result)
+        pending.append(("user", f"{task_label} {task.id}"))
+        pending.append(("assistant", result))
+        logger.info("   ✓ Completed\n")
+
+    # Record the whole batch in one history update
+    history.extend(pending)
+
+    return {
+        "tasks": tasks,
+        "results": results,
+        "history": history,
+    }
@@ -12,12 +12,19 @@ Flow:
 5. Execute fix and test
 """
 
-from src.config import load_config_and_llm
-from src.agent.planner import Planner
-from src.agent.executor import Executor
-from src.agent.history import ConversationHistory
+import logging
+import os
+import sys
+
+from src.config import warmup
+from examples.workflows._core import run_workflow
 from typing import Dict, Any, List
 
+logger = logging.getLogger(__name__)
+
+_BANNER = "=" * 50
+_RULE = "-" * 50
+
 
 def bug_fix_workflow(
     bug_description: str,
@@ -37,62 +44,40 @@ def bug_fix_workflow(
     Returns:
         Dictionary with bug fix results
     """
-    # Initialize
-    print("🐛 Bug Fix Workflow")
-    print("=" * 50)
-
-    config: Dict[str, Any]
-    llm: Any
-    config, llm = load_config_and_llm(config_file)
-
-    planner: Planner = Planner(llm)
-    executor: Executor = Executor(llm, repo_path)
-    history: ConversationHistory = ConversationHistory()
+    logger.info("🐛 Bug Fix Workflow")
+    logger.info(_BANNER)
 
     # Step 1: Analyze bug
-    print(f"\n📝 Bug Description:\n{bug_description}\n")
+    logger.info("\n📝 Bug Description:\n%s\n", bug_description)
 
     if affected_file:
-        print(f"📄 Affected File: {affected_file}\n")
-
-    history.add_message("user", f"Fix bug: {bug_description}")
-
-    # Step 2: Plan bug fix
-    bug_goal: str = f"Identify and fix: {bug_description}"
-    print("🔍 Planning bug fix steps...")
-
-    tasks: List[Any] = planner.plan(bug_goal)
-
-    print(f"\n✅ Created {len(tasks)} bug fix tasks:\n")
-    for i, task in enumerate(tasks, 1):
-        print(f"  {i}. {task.description}")
-
-    history.add_message("assistant", planner.get_plan_summary())
-
-    # Step 3: Execute fix steps
-    print("\n⚙️  Executing fix steps...\n")
-    fix_results: Dict[int, str] = {}
-
-    for task in tasks:
-        print(f"🔧 {task.description}")
-        try:
-            result: str = executor.execute_task(task)
-            fix_results[task.id] = result
-            planner.mark_task_complete(task.id, result)
-            history.add_message("user", f"Execute task {task.id}")
-            history.add_message("assistant", result)
-            print(f"   ✓ Completed\n")
-        except Exception as e:
-            print(f"   ✗ Failed: {e}\n")
-            fix_results[task.id] = f"Failed: {str(e)}"
+        logger.info("📄 Affected File: %s\n", affected_file)
+
+    # Steps 2-3: Plan and execute fix steps
+    run: Dict[str, Any] = run_workflow(
+        f"Identify and fix: {bug_description}",
+        request=f"Fix bug: {bug_description}",
+        steps_label="bug fix tasks",
+        emoji="🔧",
+        repo_path=repo_path,
+        config_file=config_file,
+    )
+    tasks: List[Any] = run["tasks"]
+    fix_results: Dict[int, str] = {
+        task_id: f"Failed: {result}" if isinstance(result, Exception) else result
+        for task_id, result in run["results"].items()
+    }
 
     # Step 4: Generate report
-    print("📋 Bug Fix Report")
-    print("-" * 50)
-    summary: Dict[str, Any] = history.get_summary()
-    print(f"Bug: {bug_description}")
-    print(f"Status: {'Fixed' if len(fix_results) == len(tasks) else 'Partial Fix'}")
-    print(f"Steps Completed: {len(fix_results)}/{len(tasks)}")
+    summary: Dict[str, Any] = run["history"].get_summary()
+    logger.info(
+        "📋 Bug Fix Report\n%s\nBug: %s\nStatus: %s\nSteps Completed: %s/%s",
+        _RULE,
+        bug_description,
+        "Fixed" if len(fix_results) == len(tasks) else "Partial Fix",
+        len(fix_results),
+        len(tasks),
+    )
 
     return {
         "bug": bug_description,
@@ -105,6 +90,13 @@ def bug_fix_workflow(
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.environ.get("AGENT_LOG_LEVEL", "INFO").upper(),
+        format="%(message)s",
+        stream=sys.stdout,
+    )
+    warmup("agent.config.yaml")
+
     # Example usage
     result: Dict[str, Any] = bug_fix_workflow(
         bug_description="API returns 500 error when creating user with duplicate email",
@@ -113,4 +105,4 @@ if __name__ == "__main__":
         config_file="agent.config.yaml"
     )
 
-    print("\n✨ Bug fix workflow completed!")
+    logger.info("\n✨ Bug fix workflow completed!")
@@ -11,12 +11,18 @@ Flow:
 4. Track progress with conversation history
 """
 
-from src.config import load_config_and_llm
-from src.agent.planner import Planner
-from src.agent.executor import Executor
-from src.agent.history import ConversationHistory
+import logging
+import os
+import sys
+
+from src.config import warmup
+from examples.workflows._core import run_workflow
 from typing import Dict, Any
 
+logger = logging.getLogger(__name__)
+
+_RULE = "-" * 50
+
 
 def feature_implementation_workflow(
     feature_goal: str,
@@ -34,55 +40,30 @@ def feature_implementation_workflow(
     Returns:
         Dictionary with workflow results including tasks and execution status
     """
-    # Step 1: Load configuration and initialize LLM
-    print("🔧 Loading configuration...")
-    config: Dict[str, Any]
-    llm: Any
-    config, llm = load_config_and_llm(config_file)
-
-    # Step 2: Initialize agent components
-    print("🚀 Initializing agent components...")
-    planner: Planner = Planner(llm)
-    executor: Executor = Executor(llm, repo_path)
-    history: ConversationHistory = ConversationHistory()
-
-    # Step 3: Plan the feature
-    print(f"\n📋 Planning feature: {feature_goal}\n")
-    history.add_message("user", f"Implement feature: {feature_goal}")
-
-    tasks: list = planner.plan(feature_goal)
-    print(f"✅ Created {len(tasks)} implementation tasks:\n")
-
-    for i, task in enumerate(tasks, 1):
-        print(f"  {i}. {task.description}")
-
-    plan_summary: str = planner.get_plan_summary()
-    history.add_message("assistant", plan_summary)
-
-    # Step 4: Execute tasks
-    print("\n⚙️  Executing tasks...\n")
-    results: Dict[int, str] = {}
-
-    for i, task in enumerate(tasks, 1):
-        print(f"[{i}/{len(tasks)}] Executing: {task.description}")
-        try:
-            result: str = executor.execute_task(task)
-            results[task.id] = result
-            planner.mark_task_complete(task.id, result)
-            history.add_message("user", f"Execute task {task.id}")
-            history.add_message("assistant", result)
-            print(f"    ✓ Task completed\n")
-        except Exception as e:
-            print(f"    ✗ Task failed: {e}\n")
-            results[task.id] = f"Failed: {str(e)}"
+    # Steps 1-4: Plan the feature and execute its tasks
+    logger.info("\n📋 Feature Goal:\n%s\n", feature_goal)
+    run: Dict[str, Any] = run_workflow(
+        feature_goal,
+        request=f"Implement feature: {feature_goal}",
+        steps_label="implementation tasks",
+        repo_path=repo_path,
+        config_file=config_file,
+    )
+    tasks = run["tasks"]
+    results: Dict[int, str] = {
+        task_id: f"Failed: {result}" if isinstance(result, Exception) else result
+        for task_id, result in run["results"].items()
+    }
 
     # Step 5: Generate summary
-    print("\n📊 Workflow Summary")
-    print("-" * 50)
-    summary: Dict[str, Any] = history.get_summary()
-    print(f"Total Messages: {summary['total_messages']}")
-    print(f"Tasks Completed: {len(results)}")
-    print(f"Workflow Status: {'Completed' if len(results) == len(tasks) else 'Partial'}")
+    summary: Dict[str, Any] = run["history"].get_summary()
+    logger.info(
+        "\n📊 Workflow Summary\n%s\nTotal Messages: %s\nTasks Completed: %s\nWorkflow Status: %s",
+        _RULE,
+        summary["total_messages"],
+        len(results),
+        "Completed" if len(results) == len(tasks) else "Partial",
+    )
 
     return {
         "feature": feature_goal,
@@ -94,6 +75,13 @@ def feature_implementation_workflow(
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.environ.get("AGENT_LOG_LEVEL", "INFO").upper(),
+        format="%(message)s",
+        stream=sys.stdout,
+    )
+    warmup("agent.config.yaml")
+
     # Example usage
     result: Dict[str, Any] = feature_implementation_workflow(
         feature_goal="Create a REST API endpoint for user management",
@@ -101,5 +89,5 @@ if __name__ == "__main__":
         config_file="agent.config.yaml"
     )
 
-    print("\n✨ Workflow completed!")
-    print(f"Results: {result}")
+    logger.info("\n✨ Workflow completed!")
+    logger.info("Results: %s", result)
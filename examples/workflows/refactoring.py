@@ -12,12 +12,19 @@ Flow:
 5. Run tests to verify
 """
 
-from src.config import load_config_and_llm
-from src.agent.planner import Planner
-from src.agent.executor import Executor
-from src.agent.history import ConversationHistory
+import logging
+import os
+import sys
+
+from src.config import warmup
+from examples.workflows._core import run_workflow
 from typing import Dict, Any, List
 
+logger = logging.getLogger(__name__)
+
+_BANNER = "=" * 50
+_RULE = "-" * 50
+
 
 def refactoring_workflow(
     refactoring_goal: str,
@@ -37,83 +44,74 @@ def refactoring_workflow(
     Returns:
         Dictionary with refactoring results
     """
-    print("♻️  Code Refactoring Workflow")
-    print("=" * 50)
-
-    # Initialize
-    config: Dict[str, Any]
-    llm: Any
-    config, llm = load_config_and_llm(config_file)
-
-    planner: Planner = Planner(llm)
-    executor: Executor = Executor(llm, repo_path)
-    history: ConversationHistory = ConversationHistory()
+    logger.info("♻️  Code Refactoring Workflow")
+    logger.info(_BANNER)
 
     # Step 1: Define refactoring scope
-    print(f"\n📋 Refactoring Goal:\n{refactoring_goal}\n")
+    logger.info("\n📋 Refactoring Goal:\n%s\n", refactoring_goal)
 
     if target_files:
-        print("📄 Target Files:")
+        logger.info("📄 Target Files:")
         for file in target_files:
-            print(f"  - {file}")
-        print()
-
-    history.add_message("user", f"Refactor: {refactoring_goal}")
-
-    # Step 2: Plan refactoring
-    print("🔍 Planning refactoring steps...")
-
-    tasks: List[Any] = planner.plan(refactoring_goal)
-
-    print(f"\n✅ Created {len(tasks)} refactoring steps:\n")
-    for i, task in enumerate(tasks, 1):
-        print(f"  {i}. {task.description}")
-
-    history.add_message("assistant", planner.get_plan_summary())
-
-    # Step 3: Apply refactoring
-    print("\n⚙️  Applying refactoring changes...\n")
+            logger.info("  - %s", file)
+        logger.info("")
+
+    # Steps 2-3: Plan and apply refactoring
+    run: Dict[str, Any] = run_workflow(
+        refactoring_goal,
+        request=f"Refactor: {refactoring_goal}",
+        steps_label="refactoring steps",
+        task_label="Execute refactoring task",
+        emoji="🔧",
+        repo_path=repo_path,
+        config_file=config_file,
+    )
+    tasks: List[Any] = run["tasks"]
     changes: Dict[int, Dict[str, Any]] = {}
 
     for task in tasks:
-        print(f"🔧 {task.description}")
-        try:
-            result: str = executor.execute_task(task)
-            planner.mark_task_complete(task.id, result)
-            history.add_message("user", f"Execute refactoring task {task.id}")
-            history.add_message("assistant", result)
-
+        result = run["results"][task.id]
+        if isinstance(result, Exception):
             changes[task.id] = {
                 "task": task.description,
-                "result": result,
-                "status": "completed"
+                "error": str(result),
+                "status": "failed"
             }
-            print(f"   ✓ Completed\n")
-        except Exception as e:
+        else:
             changes[task.id] = {
                 "task": task.description,
-                "error": str(e),
-                "status": "failed"
+                "result": result,
+                "status": "completed"
             }
-            print(f"   ✗ Failed: {e}\n")
 
     # Step 4: Verification
-    print("✅ Refactoring Verification")
-    print("-" * 50)
-    print(f"Refactoring Goal: {refactoring_goal}")
-    print(f"Tasks Completed: {len([c for c in changes.values() if c['status'] == 'completed'])}/{len(tasks)}")
-    print(f"Status: {'Success' if all(c['status'] == 'completed' for c in changes.values()) else 'Partial'}")
+    completed = sum(1 for c in changes.values() if c["status"] == "completed")
+    logger.info(
+        "✅ Refactoring Verification\n%s\nRefactoring Goal: %s\nTasks Completed: %s/%s\nStatus: %s",
+        _RULE,
+        refactoring_goal,
+        completed,
+        len(tasks),
+        "Success" if completed == len(changes) else "Partial",
+    )
 
     return {
         "goal": refactoring_goal,
         "target_files": target_files or [],
         "tasks": len(tasks),
         "changes": changes,
-        "history": history.get_summary(),
+        "history": run["history"].get_summary(),
     }
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.environ.get("AGENT_LOG_LEVEL", "INFO").upper(),
+        format="%(message)s",
+        stream=sys.stdout,
+    )
+    warmup("agent.config.yaml")
+
     # Example usage
     result: Dict[str, Any] = refactoring_workflow(
         refactoring_goal="Extract database operations into a separate repository pattern class",
@@ -122,4 +120,4 @@ if __name__ == "__main__":
         config_file="agent.config.yaml"
     )
 
-    print("\n✨ Refactoring workflow completed!")
+    logger.info("\n✨ Refactoring workflow completed!")
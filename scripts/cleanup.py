@@ -6,7 +6,9 @@ Removes temporary files and organizes project for production.
 """
 
 import os
+import re
 import shutil
+import fnmatch
 from pathlib import Path
 import logging
 
@@ -27,29 +29,38 @@ def remove_unwanted_files():
         ".DS_Store",
     ]
 
+    # Wildcard patterns remove matching files, plain names remove matching
+    # directories; both are checked during a single walk of the tree
+    file_regex = re.compile("|".join(fnmatch.translate(p) for p in unwanted_patterns if "*" in p))
+    dir_names = {p for p in unwanted_patterns if "*" not in p}
+
     removed_count = 0
 
-    for pattern in unwanted_patterns:
-        if "*" in pattern:
-            # Handle wildcards
-            for file in Path(".").rglob(pattern):
-                if file.is_file():
-                    try:
-                        file.unlink()
-                        logger.info(f"Removed: {file}")
-                        removed_count += 1
-                    except Exception as e:
-                        logger.warning(f"Could not remove {file}: {e}")
-        else:
-            # Handle directory patterns
-            for dir_path in Path(".").rglob(pattern):
-                if dir_path.is_dir():
-                    try:
-                        shutil.rmtree(dir_path)
-                        logger.info(f"Removed directory: {dir_path}")
-                        removed_count += 1
-                    except Exception as e:
-                        logger.warning(f"Could not remove {dir_path}: {e}")
+    for root, dirs, files in os.walk("."):
+        kept = []
+        for name in dirs:
+            if name not in dir_names:
+                kept.append(name)
+                continue
+            dir_path = Path(root, name)
+            try:
+                shutil.rmtree(dir_path)
+                logger.info(f"Removed directory: {dir_path}")
+                removed_count += 1
+            except Exception as e:
+                logger.warning(f"Could not remove {dir_path}: {e}")
+        # Do not descend into directories that were just removed
+        dirs[:] = kept
+
+        for name in files:
+            if file_regex.match(name):
+                file = Path(root, name)
+                try:
+                    file.unlink()
+                    logger.info(f"Removed: {file}")
+                    removed_count += 1
+                except Exception as e:
+                    logger.warning(f"Could not remove {file}: {e}")
 
     logger.info(f"✅ Removed {removed_count} unwanted items")
 
@@ -6,9 +6,13 @@ This script demonstrates the core capabilities of the AI Agent Framework
 including task planning, execution, conversation management, and API usage.
 
 Run with: python scripts/demo.py
+          python scripts/demo.py --noninteractive   # no "Press Enter" pauses
 """
 
+import argparse
+import io
 import json
+import os
 import sys
 import time
 from typing import Any, Dict, List
@@ -26,57 +30,111 @@ COLORS = {
     "UNDERLINE": "\033[4m",
 }
 
+_IS_TTY = sys.stdout.isatty()
+
+# Piped or captured output gets no escape codes
+if not _IS_TTY:
+    for _name in COLORS:
+        COLORS[_name] = ""
+
+BOLD, BLUE, CYAN, GREEN, YELLOW, RED, END = (
+    COLORS[name] for name in ("BOLD", "BLUE", "CYAN", "GREEN", "YELLOW", "RED", "END")
+)
+
+# Fixed decorations, built once instead of on every call
+_HEADER_BAR = f"{BOLD}{BLUE}{'=' * 60}{END}"
+_STATUS_COLORS = {"completed": GREEN, "in_progress": YELLOW, "pending": CYAN}
+
 
 def print_header(text: str) -> None:
     """Print a formatted header."""
-    print(f"\n{COLORS['BOLD']}{COLORS['BLUE']}{'=' * 60}{COLORS['END']}")
-    print(f"{COLORS['BOLD']}{COLORS['BLUE']}{text.center(60)}{COLORS['END']}")
-    print(f"{COLORS['BOLD']}{COLORS['BLUE']}{'=' * 60}{COLORS['END']}\n")
+    sys.stdout.write(f"\n{_HEADER_BAR}\n{BOLD}{BLUE}{text.center(60)}{END}\n{_HEADER_BAR}\n\n")
 
 
 def print_section(text: str) -> None:
     """Print a formatted section title."""
-    print(f"\n{COLORS['CYAN']}{COLORS['BOLD']}► {text}{COLORS['END']}")
-    print(f"{COLORS['CYAN']}{'-' * (len(text) + 2)}{COLORS['END']}\n")
+    sys.stdout.write(f"\n{CYAN}{BOLD}► {text}{END}\n{CYAN}{'-' * (len(text) + 2)}{END}\n\n")
 
 
 def print_success(text: str) -> None:
     """Print success message."""
-    print(f"{COLORS['GREEN']}✓ {text}{COLORS['END']}")
+    print(f"{GREEN}✓ {text}{END}")
 
 
 def print_info(text: str) -> None:
     """Print info message."""
-    print(f"{COLORS['CYAN']}ℹ {text}{COLORS['END']}")
+    print(f"{CYAN}ℹ {text}{END}")
 
 
 def print_warning(text: str) -> None:
     """Print warning message."""
-    print(f"{COLORS['YELLOW']}⚠ {text}{COLORS['END']}")
+    print(f"{YELLOW}⚠ {text}{END}")
 
 
 def print_error(text: str) -> None:
     """Print error message."""
-    print(f"{COLORS['RED']}✗ {text}{COLORS['END']}")
+    print(f"{RED}✗ {text}{END}")
+
+
+class _PrintBuffer:
+    """Collect writes in memory and pass them to stdout in batches."""
+
+    def __init__(self, max_size: int = 4096, max_delay: float = 0.1) -> None:
+        self._buffer = io.StringIO()
+        self._max_size = max_size
+        self._max_delay = max_delay
+        self._last_flush = time.monotonic()
+
+    def __enter__(self) -> "_PrintBuffer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+    def write(self, text: str) -> None:
+        """Buffer text, flushing once the size or time threshold is reached."""
+        self._buffer.write(text)
+        if (
+            self._buffer.tell() >= self._max_size
+            or time.monotonic() - self._last_flush >= self._max_delay
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out everything buffered so far."""
+        sys.stdout.write(self._buffer.getvalue())
+        sys.stdout.flush()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._last_flush = time.monotonic()
 
 
 def simulate_typing(text: str, delay: float = 0.01) -> None:
     """Simulate typing effect for better UX."""
-    for char in text:
-        sys.stdout.write(char)
-        sys.stdout.flush()
-        time.sleep(delay)
-    print()
+    if not _IS_TTY:
+        # Nobody watches piped output being typed; write it at once
+        sys.stdout.write(text + "\n")
+        return
+
+    # Flushing every character costs a write per byte; a batch every 0.1 s
+    # still reads as typing
+    with _PrintBuffer() as buf:
+        for char in text:
+            buf.write(char)
+            time.sleep(delay)
+        buf.write("\n")
 
 
 def demo_task_planning() -> None:
     """Demo 1: Task Planning - Breaking down complex goals."""
     print_section("DEMO 1: Task Planning with LLM")
 
+    lines: List[str] = []
+
     goal = "Create a REST API for user management with authentication"
-    print(f"Goal: {COLORS['BOLD']}{goal}{COLORS['END']}\n")
+    lines.append(f"Goal: {BOLD}{goal}{END}\n")
 
-    print("Planning tasks (simulated)...\n")
+    lines.append("Planning tasks (simulated)...\n")
 
     tasks: List[Dict[str, Any]] = [
         {
@@ -112,15 +170,13 @@ def demo_task_planning() -> None:
     ]
 
     for task in tasks:
-        status_color = {
-            "completed": COLORS["GREEN"],
-            "in_progress": COLORS["YELLOW"],
-            "pending": COLORS["CYAN"],
-        }[task["status"]]
+        status_color = _STATUS_COLORS[task["status"]]
+
+        lines.append(f"  Task {task['id']}: {task['title']}")
+        lines.append(f"    Status: {status_color}[{task['status'].upper()}]{END}")
+        lines.append(f"    {task['description']}\n")
 
-        print(f"  Task {task['id']}: {task['title']}")
-        print(f"    Status: {status_color}[{task['status'].upper()}]{COLORS['END']}")
-        print(f"    {task['description']}\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print_success("Task planning completed! Ready for execution.\n")
 
@@ -129,6 +185,8 @@ def demo_conversation_management() -> None:
     """Demo 2: Conversation Management - Multi-turn interactions."""
     print_section("DEMO 2: Conversation Management")
 
+    lines: List[str] = []
+
     conversation_history = [
         {"role": "user", "content": "Create a REST API for user management"},
         {
@@ -153,11 +211,13 @@ def demo_conversation_management() -> None:
         },
     ]
 
-    print(f"Conversation history ({len(conversation_history)} messages):\n")
+    lines.append(f"Conversation history ({len(conversation_history)} messages):\n")
 
     for i, msg in enumerate(conversation_history, 1):
-        role_label = f"{COLORS['BOLD']}{msg['role'].upper()}{COLORS['END']}"
-        print(f"{i}. {role_label}: {msg['content']}\n")
+        role_label = f"{BOLD}{msg['role'].upper()}{END}"
+        lines.append(f"{i}. {role_label}: {msg['content']}\n")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print_success(f"Conversation with {len(conversation_history)} messages tracked.\n")
 
@@ -166,6 +226,8 @@ def demo_repository_analysis() -> None:
     """Demo 3: Repository Analysis - Understanding codebases."""
     print_section("DEMO 3: Repository Analysis")
 
+    lines: List[str] = []
+
     repo_stats = {
         "total_files": 42,
         "python_files": 28,
@@ -176,28 +238,30 @@ def demo_repository_analysis() -> None:
         "largest_file": ("src/api.py", 523),
     }
 
-    print("Repository scan results:\n")
-    print(
-        f"  Total files: {COLORS['YELLOW']}{repo_stats['total_files']}{COLORS['END']}"
+    lines.append("Repository scan results:\n")
+    lines.append(
+        f"  Total files: {YELLOW}{repo_stats['total_files']}{END}"
     )
-    print(
-        f"  Python files: {COLORS['YELLOW']}{repo_stats['python_files']}{COLORS['END']}"
+    lines.append(
+        f"  Python files: {YELLOW}{repo_stats['python_files']}{END}"
     )
-    print(f"  Test files: {COLORS['YELLOW']}{repo_stats['test_files']}{COLORS['END']}")
-    print(
-        f"  Documentation: {COLORS['YELLOW']}{repo_stats['documentation_files']}{COLORS['END']}"
+    lines.append(f"  Test files: {YELLOW}{repo_stats['test_files']}{END}")
+    lines.append(
+        f"  Documentation: {YELLOW}{repo_stats['documentation_files']}{END}"
     )
-    print(
-        f"  Total lines: {COLORS['YELLOW']}{repo_stats['total_lines']}{COLORS['END']}"
+    lines.append(
+        f"  Total lines: {YELLOW}{repo_stats['total_lines']}{END}"
     )
-    print(
-        f"  Average file size: {COLORS['YELLOW']}{repo_stats['average_file_size']} lines{COLORS['END']}"
+    lines.append(
+        f"  Average file size: {YELLOW}{repo_stats['average_file_size']} lines{END}"
     )
-    print(
-        f"  Largest file: {COLORS['YELLOW']}{repo_stats['largest_file'][0]}{COLORS['END']} "
+    lines.append(
+        f"  Largest file: {YELLOW}{repo_stats['largest_file'][0]}{END} "
         f"({repo_stats['largest_file'][1]} lines)\n"
     )
 
+    sys.stdout.write("\n".join(lines) + "\n")
+
     print_success("Repository analysis completed.\n")
 
 
@@ -205,7 +269,9 @@ def demo_api_integration() -> None:
     """Demo 4: REST API Integration - Remote access."""
     print_section("DEMO 4: REST API Integration")
 
-    print("Demonstrating REST API endpoints:\n")
+    lines: List[str] = []
+
+    lines.append("Demonstrating REST API endpoints:\n")
 
     endpoints = [
         {
@@ -244,11 +310,13 @@ def demo_api_integration() -> None:
     ]
 
     for ep in endpoints:
-        print(
-            f"  {COLORS['BOLD']}{ep['method']:<6}{COLORS['END']} {COLORS['CYAN']}{ep['endpoint']:<20}{COLORS['END']}"
+        lines.append(
+            f"  {BOLD}{ep['method']:<6}{END} {CYAN}{ep['endpoint']:<20}{END}"
         )
-        print(f"    {ep['description']}")
-        print(f"    Response: {json.dumps(ep['response'], indent=18)}\n")
+        lines.append(f"    {ep['description']}")
+        lines.append(f"    Response: {json.dumps(ep['response'], indent=18)}\n")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print_success("API integration demonstrated.\n")
 
@@ -257,6 +325,8 @@ def demo_llm_providers() -> None:
     """Demo 5: Multi-provider LLM Support."""
     print_section("DEMO 5: Multi-Provider LLM Support")
 
+    lines: List[str] = []
+
     providers = [
         {
             "name": "Ollama",
@@ -279,10 +349,12 @@ def demo_llm_providers() -> None:
     ]
 
     for provider in providers:
-        print(f"{COLORS['BOLD']}{provider['name']}{COLORS['END']}")
-        print(f"  Status: {provider['status']}")
-        print(f"  Available models: {', '.join(provider['models'])}")
-        print(f"  Setup: {provider['setup']}\n")
+        lines.append(f"{BOLD}{provider['name']}{END}")
+        lines.append(f"  Status: {provider['status']}")
+        lines.append(f"  Available models: {', '.join(provider['models'])}")
+        lines.append(f"  Setup: {provider['setup']}\n")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print_success("Multi-provider LLM support ready.\n")
 
@@ -291,6 +363,8 @@ def demo_code_examples() -> None:
     """Demo 6: Quick Code Examples."""
     print_section("DEMO 6: Quick Code Examples")
 
+    lines: List[str] = []
+
     examples = [
         {
             "title": "CLI Usage",
@@ -318,8 +392,10 @@ llm:
     ]
 
     for i, example in enumerate(examples, 1):
-        print(f"{i}. {COLORS['BOLD']}{example['title']}{COLORS['END']}")
-        print(f"   {COLORS['YELLOW']}{example['code']}{COLORS['END']}\n")
+        lines.append(f"{i}. {BOLD}{example['title']}{END}")
+        lines.append(f"   {YELLOW}{example['code']}{END}\n")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print_success("Code examples ready for reference.\n")
 
@@ -328,6 +404,8 @@ def demo_workflow_templates() -> None:
     """Demo 7: Workflow Templates - Pre-built use cases."""
     print_section("DEMO 7: Workflow Templates")
 
+    lines: List[str] = []
+
     templates = [
         {
             "name": "Feature Implementation",
@@ -357,9 +435,11 @@ def demo_workflow_templates() -> None:
     ]
 
     for template in templates:
-        print(f"• {COLORS['BOLD']}{template['name']}{COLORS['END']}")
-        print(f"  {template['description']}")
-        print(f"  Steps: {template['steps']}\n")
+        lines.append(f"• {BOLD}{template['name']}{END}")
+        lines.append(f"  {template['description']}")
+        lines.append(f"  Steps: {template['steps']}\n")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     print_success(f"Found {len(templates)} pre-built workflow templates.\n")
 
@@ -368,6 +448,8 @@ def show_next_steps() -> None:
     """Show next steps for users."""
     print_section("Next Steps")
 
+    lines: List[str] = []
+
     steps = [
         "1. Read the documentation: docs/API.md, docs/DEPLOYMENT.md",
         "2. Configure LLM provider: Create agent.config.yaml",
@@ -378,35 +460,52 @@ def show_next_steps() -> None:
     ]
 
     for step in steps:
-        print(f"  {COLORS['GREEN']}→{COLORS['END']} {step}")
+        lines.append(f"  {GREEN}→{END} {step}")
 
-    print()
+    lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main() -> None:
     """Run the demo."""
+    parser = argparse.ArgumentParser(description="AI Agent Framework demo")
+    parser.add_argument(
+        "--noninteractive",
+        action="store_true",
+        default=os.environ.get("AGENT_AI_DEMO_AUTO") == "1",
+        help="Run straight through without pausing between demos (or set AGENT_AI_DEMO_AUTO=1)",
+    )
+    args = parser.parse_args()
+
+    if args.noninteractive:
+        def pause() -> None:
+            pass
+    else:
+        def pause() -> None:
+            input(f"{BOLD}Press Enter to continue...{END}")
+
     print_header("AI Agent Framework - Interactive Demo")
 
     print_info("This demo showcases the core capabilities of the AI Agent Framework.\n")
 
     # Run all demos
     demo_task_planning()
-    input(f"{COLORS['BOLD']}Press Enter to continue...{COLORS['END']}")
+    pause()
 
     demo_conversation_management()
-    input(f"{COLORS['BOLD']}Press Enter to continue...{COLORS['END']}")
+    pause()
 
     demo_repository_analysis()
-    input(f"{COLORS['BOLD']}Press Enter to continue...{COLORS['END']}")
+    pause()
 
     demo_api_integration()
-    input(f"{COLORS['BOLD']}Press Enter to continue...{COLORS['END']}")
+    pause()
 
     demo_llm_providers()
-    input(f"{COLORS['BOLD']}Press Enter to continue...{COLORS['END']}")
+    pause()
 
     demo_code_examples()
-    input(f"{COLORS['BOLD']}Press Enter to continue...{COLORS['END']}")
+    pause()
 
     demo_workflow_templates()
 
@@ -422,5 +521,5 @@ if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
-        print(f"\n{COLORS['YELLOW']}Demo interrupted by user.{COLORS['END']}")
+        print(f"\n{YELLOW}Demo interrupted by user.{END}")
         sys.exit(0)
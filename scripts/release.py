@@ -13,13 +13,24 @@ Usage:
     python scripts/release.py validate           # Validate release
 """
 
+import os
 import re
 import sys
+import shutil
+import tempfile
 import argparse
+import functools
+import py_compile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Tuple, Optional
 
+_VERSION_RE = re.compile(r'version="([^"]*)"')
+# parse_version accepts a prefix match, is_valid_version requires a full one
+_SEMVER_RE = re.compile(r"(\d+)\.(\d+)\.(\d+)")
 
+
+@functools.lru_cache(maxsize=1)
 def get_current_version() -> str:
     """Get current version from setup.py."""
     setup_file = Path("setup.py")
@@ -27,7 +38,7 @@ def get_current_version() -> str:
         raise FileNotFoundError("setup.py not found")
 
     content = setup_file.read_text()
-    match = re.search(r'version="([^"]*)"', content)
+    match = _VERSION_RE.search(content)
     if not match:
         raise ValueError("Could not find version in setup.py")
 
@@ -36,7 +47,7 @@ def get_current_version() -> str:
 
 def parse_version(version: str) -> Tuple[int, int, int]:
     """Parse version string into (major, minor, patch)."""
-    match = re.match(r"(\d+)\.(\d+)\.(\d+)", version)
+    match = _SEMVER_RE.match(version)
     if not match:
         raise ValueError(f"Invalid version format: {version}")
 
@@ -57,6 +68,31 @@ def bump_version(version: str, bump_type: str) -> str:
         raise ValueError(f"Invalid bump type: {bump_type}")
 
 
+def _atomic_replace(path: Path, old_text: str, new_text: str) -> Optional[str]:
+    """Replace text in a file through a temp file and os.replace.
+
+    Returns None on success, otherwise a message saying why it was skipped.
+    """
+    if not path.exists():
+        return f"File not found: {path}"
+
+    content = path.read_text()
+    if old_text not in content:
+        return f"Old version not found in {path}"
+
+    # A rename is atomic, so an interrupted bump never leaves a half-written file
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(content.replace(old_text, new_text))
+        shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return None
+
+
 def update_version_in_files(old_version: str, new_version: str) -> None:
     """Update version in all relevant files."""
     files_to_update = [
@@ -65,19 +101,14 @@ def update_version_in_files(old_version: str, new_version: str) -> None:
     ]
 
     for filepath, old_text, new_text in files_to_update:
-        path = Path(filepath)
-        if not path.exists():
-            print(f"⚠️  File not found: {filepath}")
-            continue
-
-        content = path.read_text()
-        if old_text not in content:
-            print(f"⚠️  Old version not found in {filepath}")
-            continue
+        problem = _atomic_replace(Path(filepath), old_text, new_text)
+        if problem:
+            print(f"⚠️  {problem}")
+        else:
+            print(f"✓ Updated {filepath}")
 
-        new_content = content.replace(old_text, new_text)
-        path.write_text(new_content)
-        print(f"✓ Updated {filepath}")
+    # setup.py may have changed under the cached version
+    get_current_version.cache_clear()
 
 
 def check_changelog(version: str) -> bool:
@@ -94,15 +125,21 @@ def validate_release(version: str) -> bool:
     """Validate that release is ready."""
     print(f"\n🔍 Validating release v{version}...\n")
 
+    # Cheapest first; once one fails the rest are skipped, so a bad version
+    # string or dirty tree never pays for compiling the whole of src/
     checks = [
-        ("Version format", is_valid_version(version)),
-        ("Changelog entry", check_changelog(version)),
-        ("Git repo clean", is_git_clean()),
-        ("Python syntax", check_python_syntax()),
+        ("Version format", lambda: is_valid_version(version)),
+        ("Changelog entry", lambda: check_changelog(version)),
+        ("Git repo clean", is_git_clean),
+        ("Python syntax", check_python_syntax),
     ]
 
     all_passed = True
-    for check_name, passed in checks:
+    for check_name, check in checks:
+        if not all_passed:
+            print(f"  - {check_name} (skipped)")
+            continue
+        passed = check()
         status = "✓" if passed else "✗"
         print(f"  {status} {check_name}")
         if not passed:
@@ -113,7 +150,7 @@ def validate_release(version: str) -> bool:
 
 def is_valid_version(version: str) -> bool:
     """Check if version string is valid."""
-    return bool(re.match(r"^\d+\.\d+\.\d+$", version))
+    return _SEMVER_RE.fullmatch(version) is not None
 
 
 def is_git_clean() -> bool:
@@ -131,17 +168,33 @@ def is_git_clean() -> bool:
         return False
 
 
-def check_python_syntax() -> bool:
-    """Check Python syntax in src/."""
-    import py_compile
+def _compile_one(path: str) -> bool:
+    """Compile one file, returning whether it is valid Python."""
     try:
-        for py_file in Path("src").rglob("*.py"):
-            py_compile.compile(str(py_file), doraise=True)
+        py_compile.compile(path, doraise=True)
         return True
     except Exception:
         return False
 
 
+def check_python_syntax() -> bool:
+    """Check Python syntax in src/."""
+    files = [str(py_file) for py_file in Path("src").rglob("*.py")]
+    if not files:
+        return True
+
+    # Compiling is CPU bound, so spread the files over processes
+    with ProcessPoolExecutor() as executor:
+        futures = [executor.submit(_compile_one, path) for path in files]
+        for future in as_completed(futures):
+            if not future.result():
+                # Stop at the first failure; files not started yet are skipped
+                for pending in futures:
+                    pending.cancel()
+                return False
+    return True
+
+
 def main() -> None:
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -11,7 +11,7 @@ setup(
     author="AI Agent Team",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
-    py_modules=["cli", "config", "api", "persistence", "auth", "websocket_support", "templates", "analytics"],
+    py_modules=["cli", "config", "api", "persistence", "auth", "websocket_support", "templates", "analytics", "caching"],
     python_requires=">=3.8",
     install_requires=[
         "pyyaml>=6.0",
@@ -25,7 +25,7 @@ setup(
     ],
     entry_points={
         "console_scripts": [
-            "agent-ai=src.cli:main",
+            "agent-ai=cli:main",
         ],
     },
     classifiers=[
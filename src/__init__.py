@@ -25,70 +25,90 @@ Example usage:
 
 __author__ = "AI Agent Team"
 
-import sys
+import importlib
 import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import sys
 
-# Core configuration and agent framework
-from config import load_config_and_llm
-from agent.planner import Planner, Task
-from agent.executor import Executor
-from agent.history import ConversationHistory
-from llm.base import LLM
-from llm.ollama import Ollama
-from llm.openai_like import OpenAILike
-from repo.scanner import Scanner
-from repo.patcher import Patcher
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Phase 7 exports (webhooks, query engine, caching, performance)
-from .webhooks import (
-    EventType,
-    WebhookManager,
-    WebhookEvent,
-    WebhookDelivery,
-    EventStream,
-)
-from .query_engine import (
-    QueryFilterBuilder,
-    QueryExecutor,
-    SearchEngine,
-)
-from .caching import (
-    MemoryCache,
-    PersistentCache,
-    CacheDecorator,
-)
-from .performance import (
-    PerformanceProfiler,
-    profile_operation,
-    QueryOptimizer,
-)
-from .advanced_pro import (
-    CircuitBreaker,
-    RateLimiter,
-    RequestSignature,
-    AdaptiveCaching,
-    DistributedTracing,
-    AdvancedAnalytics,
-    AdvancedMetrics,
+# Exported names are imported on first access (PEP 562), so importing the
+# package, or one of its submodules, does not load every feature module.
+# Each entry is (name, "module") or (name, "module:attribute") when the
+# attribute is bound under a different name there; __all__ and the lazy
+# lookup table are both built from this one tuple.
+#
+# Modules without a leading dot are imported by their top-level name, the
+# way the core modules and the API key modules import each other, so that
+# e.g. src.Task is the same class agent.executor uses.
+_EXPORTS = (
+    # Core configuration and agent framework
+    ("AgentConfig", "config"),
+    ("load_config_and_llm", "config"),
+    ("Planner", "agent.planner"),
+    ("Task", "agent.planner"),
+    ("Executor", "agent.executor"),
+    ("ConversationHistory", "agent.history"),
+    ("LLM", "llm.base"),
+    ("Ollama", "llm.ollama"),
+    ("OpenAILike", "llm.openai_like"),
+    ("Scanner", "repo.scanner"),
+    ("Patcher", "repo.patcher"),
+    # Phase 7 exports (webhooks, query engine, caching, performance)
+    ("EventType", ".webhooks"),
+    ("WebhookManager", ".webhooks"),
+    ("WebhookEvent", ".webhooks"),
+    ("WebhookDelivery", ".webhooks"),
+    ("EventStream", ".webhooks"),
+    ("QueryFilterBuilder", ".query_engine"),
+    ("QueryExecutor", ".query_engine"),
+    ("SearchEngine", ".query_engine"),
+    ("MemoryCache", ".caching"),
+    ("PersistentCache", ".caching"),
+    ("CacheDecorator", ".caching"),
+    ("PerformanceProfiler", ".performance"),
+    ("profile_operation", ".performance"),
+    ("QueryOptimizer", ".performance"),
+    ("CircuitBreaker", ".advanced_pro"),
+    ("CircuitState", ".advanced_pro"),
+    ("RateLimiter", ".advanced_pro"),
+    ("RequestSignature", ".advanced_pro"),
+    ("AdaptiveCaching", ".advanced_pro"),
+    ("DistributedTracing", ".advanced_pro"),
+    ("AdvancedAnalytics", ".advanced_pro"),
+    ("AdvancedMetrics", ".advanced_pro"),
+    # API Key Management
+    ("APIKeyManager", "api_keys"),
+    ("KeyStatus", "api_keys"),
+    ("APIKeyInfo", "api_keys"),
+    ("get_api_key_manager", "api_keys"),
+    ("api_keys_router", "api_keys_routes:router"),
+    ("APIKeyAuthMiddleware", "api_key_middleware"),
+    ("get_api_key_from_request", "api_key_middleware"),
+    ("get_api_key_owner", "api_key_middleware"),
+    ("get_api_key_scopes", "api_key_middleware"),
+    ("require_api_key_scope", "api_key_middleware"),
+    ("require_api_authentication", "api_key_middleware"),
 )
 
-# API Key Management
-from .api_keys import (
-    APIKeyManager,
-    KeyStatus,
-    APIKeyInfo,
-    get_api_key_manager,
-)
-from .api_keys_routes import router as api_keys_router
-from .api_key_middleware import (
-    APIKeyAuthMiddleware,
-    get_api_key_from_request,
-    get_api_key_owner,
-    get_api_key_scopes,
-    require_api_key_scope,
-    require_api_authentication,
-)
+_LAZY = dict(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module_name, _, attr = _LAZY[name].partition(":")
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    if not module_name.startswith(".") and _SRC_DIR not in sys.path:
+        sys.path.insert(0, _SRC_DIR)
+    value = getattr(importlib.import_module(module_name, __name__), attr or name)
+    # Later lookups find the name directly and skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 
 # Prefer package version from src/__version__.py when available
 try:
@@ -97,51 +117,4 @@ try:
 except Exception:
     __version__ = "0.1.0"
 
-__all__ = [
-    "load_config_and_llm",
-    "Planner",
-    "Task",
-    "Executor",
-    "ConversationHistory",
-    "LLM",
-    "Ollama",
-    "OpenAILike",
-    "Scanner",
-    "Patcher",
-    # Phase 7 exports
-    "EventType",
-    "WebhookManager",
-    "WebhookEvent",
-    "WebhookDelivery",
-    "EventStream",
-    "QueryFilterBuilder",
-    "QueryExecutor",
-    "SearchEngine",
-    "MemoryCache",
-    "PersistentCache",
-    "CacheDecorator",
-    "PerformanceProfiler",
-    "profile_operation",
-    "QueryOptimizer",
-    # Advanced Pro Features
-    "CircuitBreaker",
-    "RateLimiter",
-    "RequestSignature",
-    "AdaptiveCaching",
-    "DistributedTracing",
-    "AdvancedAnalytics",
-    "AdvancedMetrics",
-    # API Key Management
-    "APIKeyManager",
-    "KeyStatus",
-    "APIKeyInfo",
-    "get_api_key_manager",
-    "api_keys_router",
-    "APIKeyAuthMiddleware",
-    "get_api_key_from_request",
-    "get_api_key_owner",
-    "get_api_key_scopes",
-    "require_api_key_scope",
-    "require_api_authentication",
-    "__version__",
-]
+__all__ = [name for name, _ in _EXPORTS] + ["__version__"]
@@ -9,18 +9,35 @@ Enterprise-grade enhancements for production deployments:
 - Analytics and insights
 """
 
-from typing import Dict, Any, Optional, Callable
+from collections import Counter, OrderedDict, defaultdict, deque
+from typing import Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from enum import IntEnum
+from fractions import Fraction
+from operator import itemgetter
 import hashlib
+import heapq
+import hmac
 import logging
+import math
+import threading
+import time
+import zlib
 
 logger = logging.getLogger(__name__)
 
 
+def _fmt_ts(ns: int) -> str:
+    """Format a time.time_ns() value; stored events keep the raw integer."""
+    return datetime.fromtimestamp(ns / 1e9).isoformat()
+
+
 @dataclass
 class AdvancedMetrics:
     """Advanced performance metrics."""
+    __slots__ = ("operation", "duration_ms", "memory_mb", "cache_hits", "cache_misses", "timestamp")
+
     operation: str
     duration_ms: float
     memory_mb: float
@@ -42,6 +59,13 @@ class AdvancedMetrics:
         return hit_rate_score + speed_score
 
 
+class CircuitState(IntEnum):
+    """States of a CircuitBreaker."""
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
 class CircuitBreaker:
     """Circuit breaker pattern for fault tolerance."""
 
@@ -57,47 +81,64 @@ class CircuitBreaker:
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
         self.failure_count = 0
-        self.last_failure_time = None
-        self.state = "closed"  # closed, open, half-open
+        # time.monotonic() of the last failure; unaffected by clock changes
+        self.last_failure_time: Optional[float] = None
+        self.state = CircuitState.CLOSED
+        # Guards state transitions; the wrapped call itself runs unlocked
+        self._lock = threading.Lock()
 
     def call(self, func: Callable, *args, **kwargs) -> Any:
         """Execute function with circuit breaker protection."""
-        if self.state == "open":
-            if self._should_attempt_reset():
-                self.state = "half-open"
-            else:
-                raise Exception(f"Circuit breaker '{self.name}' is OPEN")
+        if self.state is CircuitState.OPEN:
+            with self._lock:
+                if self.state is CircuitState.OPEN:
+                    if not self._should_attempt_reset():
+                        raise Exception(f"Circuit breaker '{self.name}' is OPEN")
+                    self.state = CircuitState.HALF_OPEN
 
         try:
             result = func(*args, **kwargs)
-            self._on_success()
-            return result
-        except self.expected_exception as e:
+        except self.expected_exception:
             self._on_failure()
             raise
+        self._on_success()
+        return result
 
     def _should_attempt_reset(self) -> bool:
         """Check if enough time has passed to attempt reset."""
         if self.last_failure_time is None:
             return False
-        elapsed = (datetime.now() - self.last_failure_time).total_seconds()
-        return elapsed >= self.recovery_timeout
+        return time.monotonic() - self.last_failure_time >= self.recovery_timeout
 
     def _on_success(self) -> None:
         """Handle successful operation."""
-        self.failure_count = 0
-        self.state = "closed"
-        logger.info(f"Circuit breaker '{self.name}' closed")
+        # The common closed, no-failures case needs no lock and no write
+        if self.state is CircuitState.CLOSED and not self.failure_count:
+            return
+        with self._lock:
+            reopened = self.state is not CircuitState.CLOSED
+            self.failure_count = 0
+            self.state = CircuitState.CLOSED
+        if reopened:
+            logger.info(f"Circuit breaker '{self.name}' closed")
 
     def _on_failure(self) -> None:
         """Handle failed operation."""
-        self.failure_count += 1
-        self.last_failure_time = datetime.now()
-        if self.failure_count >= self.failure_threshold:
-            self.state = "open"
+        with self._lock:
+            self.failure_count += 1
+            self.last_failure_time = time.monotonic()
+            # Only the caller that makes the transition reports it
+            tripped = (
+                self.state is not CircuitState.OPEN
+                and self.failure_count >= self.failure_threshold
+            )
+            if tripped:
+                self.state = CircuitState.OPEN
+            failures = self.failure_count
+        if tripped:
             logger.warning(
                 f"Circuit breaker '{self.name}' opened after "
-                f"{self.failure_count} failures"
+                f"{failures} failures"
             )
 
 
@@ -113,23 +154,41 @@ class RateLimiter:
         """
         self.rate = rate
         self.period = period
-        self.tokens = rate
-        self.last_update = datetime.now()
+        # Tokens are kept as integers: with rate = num / den, one token is
+        # period_ns * den units and each elapsed nanosecond adds num units,
+        # so refilling is exact integer arithmetic even for float arguments
+        rate_ratio = Fraction(rate).limit_denominator(1_000_000)
+        period_ns = int(round(period * 10**9))
+        self._refill_per_ns = rate_ratio.numerator
+        self._token_ns = period_ns * rate_ratio.denominator
+        # Holds at least one token, or a rate below one per period could
+        # never allow a request
+        self._cap_ns = max(rate_ratio.numerator * period_ns, self._token_ns)
+        self._tokens_ns = self._cap_ns
+        # Monotonic nanoseconds: never jumps with the wall clock
+        self.last_update = time.monotonic_ns()
+        # Refill and take happen as one step, so concurrent callers cannot
+        # both spend the same token
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available, as of the last check."""
+        return self._tokens_ns / self._token_ns
 
     def is_allowed(self) -> bool:
         """Check if request is allowed."""
-        self._refill()
-        if self.tokens >= 1:
-            self.tokens -= 1
-            return True
-        return False
+        with self._lock:
+            self._refill()
+            if self._tokens_ns >= self._token_ns:
+                self._tokens_ns -= self._token_ns
+                return True
+            return False
 
     def _refill(self) -> None:
         """Refill tokens based on elapsed time."""
-        now = datetime.now()
-        elapsed = (now - self.last_update).total_seconds()
-        tokens_to_add = (elapsed / self.period) * self.rate
-        self.tokens = min(self.rate, self.tokens + tokens_to_add)
+        now = time.monotonic_ns()
+        self._tokens_ns = min(self._cap_ns, self._tokens_ns + (now - self.last_update) * self._refill_per_ns)
         self.last_update = now
 
 
@@ -138,49 +197,78 @@ class RequestSignature:
 
     def __init__(self, secret: str):
         self.secret = secret
+        # Keyed once; each signature starts from a copy of this state
+        self._hmac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+    def _digest(self, data: str) -> bytes:
+        mac = self._hmac.copy()
+        mac.update(data.encode())
+        return mac.digest()
 
     def sign(self, data: str) -> str:
         """Generate HMAC signature."""
-        return hashlib.sha256(
-            (data + self.secret).encode()
-        ).hexdigest()
+        return self._digest(data).hex()
 
     def verify(self, data: str, signature: str) -> bool:
         """Verify HMAC signature."""
-        expected = self.sign(data)
-        return hashlib.compare_digest(expected, signature)
+        try:
+            given = bytes.fromhex(signature)
+        except ValueError:
+            return False
+        return hmac.compare_digest(self._digest(data), given)
+
+
+class CacheEntry:
+    """A cached value with its access statistics."""
+
+    __slots__ = ("value", "count", "last_ns")
+
+    def __init__(self, value: Any, count: int, last_ns: int):
+        self.value = value
+        self.count = count
+        self.last_ns = last_ns
 
 
 class AdaptiveCaching:
     """Adaptive caching that learns access patterns."""
 
+    # Keys are spread over SHARDS dicts, each with its own lock, so
+    # concurrent callers rarely wait on each other; must be a power of two
+    SHARDS = 16
+
     def __init__(self, max_size_mb: int = 100):
         self.max_size_mb = max_size_mb
-        self.cache: Dict[str, Any] = {}
-        self.access_count: Dict[str, int] = {}
-        self.access_times: Dict[str, datetime] = {}
+        self._shards = [{} for _ in range(self.SHARDS)]
+        self._locks = [threading.Lock() for _ in range(self.SHARDS)]
+
+    def _shard(self, key: str) -> int:
+        return hash(key) & (self.SHARDS - 1)
 
     def get(self, key: str) -> Optional[Any]:
         """Get value with access tracking."""
-        if key in self.cache:
-            self.access_count[key] = self.access_count.get(key, 0) + 1
-            self.access_times[key] = datetime.now()
-            return self.cache[key]
-        return None
+        index = self._shard(key)
+        with self._locks[index]:
+            entry = self._shards[index].get(key)
+            if entry is None:
+                return None
+            entry.count += 1
+            entry.last_ns = time.time_ns()
+            return entry.value
 
     def set(self, key: str, value: Any) -> None:
         """Set value in cache."""
-        self.cache[key] = value
-        self.access_count[key] = 1
-        self.access_times[key] = datetime.now()
+        index = self._shard(key)
+        with self._locks[index]:
+            self._shards[index][key] = CacheEntry(value, 1, time.time_ns())
 
     def get_hot_keys(self, top_n: int = 10) -> list:
         """Get most frequently accessed keys."""
-        return sorted(
-            self.access_count.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:top_n]
+        counts = []
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                counts.extend((key, entry.count) for key, entry in shard.items())
+        # A heap selection instead of sorting every key
+        return heapq.nlargest(top_n, counts, key=itemgetter(1))
 
     def get_recommendations(self) -> Dict[str, str]:
         """Get caching recommendations based on patterns."""
@@ -193,16 +281,139 @@ class AdaptiveCaching:
         return recommendations
 
 
+class LatencySketch:
+    """Quantile sketch with bounded relative error (the DDSketch scheme).
+
+    Values are counted in logarithmic bins, so memory depends on the range
+    of values rather than on how many were added.
+    """
+
+    __slots__ = ("_gamma", "_inv_log_gamma", "bins", "zero_count", "count")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inv_log_gamma = 1 / math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add one value."""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) * self._inv_log_gamma)
+        self.bins[index] = self.bins.get(index, 0) + 1
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Add every value counted by another sketch of the same accuracy."""
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for index, n in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + n
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1); None when empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.bins) / (self._gamma + 1)
+
+
+class SpanBucket:
+    """Spans of one name and status that ended in one time bucket."""
+
+    __slots__ = ("count", "duration_sum", "sketch")
+
+    def __init__(self):
+        self.count = 0
+        self.duration_sum = 0.0
+        self.sketch = LatencySketch()
+
+    def add(self, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_sum += duration_ms
+        self.sketch.add(duration_ms)
+
+
+class Span:
+    """One span of a trace."""
+
+    __slots__ = ("name", "service", "duration_ms", "status", "timestamp_ns")
+
+    def __init__(self, name: str, service: str, duration_ms: float, status: str, timestamp_ns: int):
+        self.name = name
+        self.service = service
+        self.duration_ms = duration_ms
+        self.status = status
+        self.timestamp_ns = timestamp_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "service": self.service,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "timestamp": _fmt_ts(self.timestamp_ns),
+        }
+
+
 class DistributedTracing:
     """Distributed request tracing for debugging."""
 
-    def __init__(self, service_name: str):
+    # Spans are aggregated per BUCKET_NS of end time
+    BUCKET_NS = 10 * 10**9
+
+    def __init__(
+        self,
+        service_name: str,
+        max_traces: int = 100_000,
+        max_spans_per_trace: int = 1_000,
+        sample_rate: float = 1.0,
+        detailed: bool = True,
+        keep_buckets: int = 6,
+    ):
         self.service_name = service_name
-        self.traces: Dict[str, list] = {}
+        # Every span is counted in the bucket aggregates; individual spans
+        # are only stored for get_trace when detailed is set
+        self.detailed = detailed
+        self.keep_buckets = keep_buckets
+        self._buckets: Dict[Tuple[str, str, int], SpanBucket] = {}
+        self._current_bucket = 0
+        # A trace is kept when the CRC32 of its id falls below the threshold,
+        # so every service makes the same choice for the same trace
+        self.sample_rate = sample_rate
+        self._sample_threshold = int(sample_rate * 2**32)
+        self.max_traces = max_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        # Least recently used first; the oldest trace is dropped past max_traces
+        self.traces: "OrderedDict[str, deque]" = OrderedDict()
+
+    def _new_trace(self, trace_id: str) -> deque:
+        """Store an empty trace, evicting the least recently used one if full."""
+        spans = self.traces[trace_id] = deque(maxlen=self.max_spans_per_trace)
+        self.traces.move_to_end(trace_id)
+        if len(self.traces) > self.max_traces:
+            self.traces.popitem(last=False)
+        return spans
+
+    def is_sampled(self, trace_id: str) -> bool:
+        """Whether spans of this trace are recorded."""
+        return zlib.crc32(trace_id.encode()) < self._sample_threshold
 
     def start_trace(self, trace_id: str) -> None:
         """Start a new trace."""
-        self.traces[trace_id] = []
+        if not self.is_sampled(trace_id):
+            return
+        self._new_trace(trace_id)
         logger.info(f"Started trace {trace_id}")
 
     def add_span(
@@ -213,30 +424,90 @@ class DistributedTracing:
         status: str = "success"
     ) -> None:
         """Add span to trace."""
-        if trace_id not in self.traces:
-            self.traces[trace_id] = []
-
-        span = {
-            "name": span_name,
-            "service": self.service_name,
-            "duration_ms": duration_ms,
-            "status": status,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.traces[trace_id].append(span)
+        now = time.time_ns()
+        bucket = now // self.BUCKET_NS
+        if bucket != self._current_bucket:
+            self._current_bucket = bucket
+            self.flush(now)
+        key = (span_name, status, bucket)
+        aggregate = self._buckets.get(key)
+        if aggregate is None:
+            aggregate = self._buckets[key] = SpanBucket()
+        aggregate.add(duration_ms)
+
+        if not self.detailed:
+            return
+        spans = self.traces.get(trace_id)
+        if spans is None:
+            if not self.is_sampled(trace_id):
+                return
+            spans = self._new_trace(trace_id)
+        else:
+            self.traces.move_to_end(trace_id)
+
+        spans.append(Span(span_name, self.service_name, duration_ms, status, now))
         logger.debug(f"Added span {span_name} to trace {trace_id}")
 
+    def flush(self, now_ns: Optional[int] = None) -> Dict[Tuple[str, str, int], SpanBucket]:
+        """Remove and return buckets older than the most recent keep_buckets."""
+        if now_ns is None:
+            now_ns = time.time_ns()
+        oldest = now_ns // self.BUCKET_NS - self.keep_buckets + 1
+        expired = {key: b for key, b in self._buckets.items() if key[2] < oldest}
+        for key in expired:
+            del self._buckets[key]
+        return expired
+
+    def get_span_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Count, mean and latency quantiles per span name and status over the kept buckets."""
+        merged: Dict[Tuple[str, str], SpanBucket] = {}
+        for (name, status, _), bucket in self._buckets.items():
+            total = merged.get((name, status))
+            if total is None:
+                total = merged[(name, status)] = SpanBucket()
+            total.count += bucket.count
+            total.duration_sum += bucket.duration_sum
+            total.sketch.merge(bucket.sketch)
+
+        return {
+            f"{name}:{status}": {
+                "count": total.count,
+                "avg_ms": total.duration_sum / total.count,
+                "p50_ms": total.sketch.quantile(0.5),
+                "p99_ms": total.sketch.quantile(0.99),
+            }
+            for (name, status), total in merged.items()
+        }
+
     def get_trace(self, trace_id: str) -> list:
         """Get trace details."""
-        return self.traces.get(trace_id, [])
+        return [span.to_dict() for span in self.traces.get(trace_id, ())]
+
+
+class Event:
+    """One tracked analytics event."""
+
+    __slots__ = ("type", "user_id", "timestamp_ns", "metadata")
+
+    def __init__(self, event_type: str, user_id: str, timestamp_ns: int, metadata: Dict[str, Any]):
+        self.type = event_type
+        self.user_id = user_id
+        self.timestamp_ns = timestamp_ns
+        self.metadata = metadata
 
 
 class AdvancedAnalytics:
     """Advanced analytics and insights."""
 
-    def __init__(self):
-        self.events: list = []
+    def __init__(self, max_events: int = 100_000):
+        # Only the most recent max_events are kept, and the aggregates below
+        # cover exactly those
+        self.events: deque = deque(maxlen=max_events)
         self.aggregates: Dict[str, Any] = {}
+        # Maintained by track_event so the queries below need no full scan
+        self._user_events: Dict[str, deque] = defaultdict(deque)
+        self._type_counts: Counter = Counter()
+        self._user_types: Dict[str, Counter] = defaultdict(Counter)
 
     def track_event(
         self,
@@ -245,28 +516,40 @@ class AdvancedAnalytics:
         metadata: Dict[str, Any]
     ) -> None:
         """Track an event."""
-        event = {
-            "type": event_type,
-            "user_id": user_id,
-            "timestamp": datetime.now().isoformat(),
-            "metadata": metadata
-        }
+        event = Event(event_type, user_id, time.time_ns(), metadata)
+        if len(self.events) == self.events.maxlen:
+            self._forget(self.events[0])
         self.events.append(event)
+        self._user_events[user_id].append(event)
+        self._type_counts[event_type] += 1
+        self._user_types[user_id][event_type] += 1
+
+    def _forget(self, event: Event) -> None:
+        """Remove the oldest event from the aggregates before it is evicted."""
+        user_events = self._user_events[event.user_id]
+        # The globally oldest event is also that user's oldest
+        user_events.popleft()
+        if not user_events:
+            del self._user_events[event.user_id]
+            del self._user_types[event.user_id]
+        else:
+            user_types = self._user_types[event.user_id]
+            user_types[event.type] -= 1
+            if not user_types[event.type]:
+                del user_types[event.type]
+        self._type_counts[event.type] -= 1
+        if not self._type_counts[event.type]:
+            del self._type_counts[event.type]
 
     def get_user_stats(self, user_id: str) -> Dict[str, Any]:
         """Get statistics for a user."""
-        user_events = [e for e in self.events if e["user_id"] == user_id]
+        user_events = self._user_events.get(user_id, [])
+        # Events are appended in time order, so the ends are the first and last
         return {
             "total_events": len(user_events),
-            "event_types": list(set(e["type"] for e in user_events)),
-            "first_event": min(
-                (e["timestamp"] for e in user_events),
-                default=None
-            ),
-            "last_event": max(
-                (e["timestamp"] for e in user_events),
-                default=None
-            )
+            "event_types": list(self._user_types.get(user_id, ())),
+            "first_event": _fmt_ts(user_events[0].timestamp_ns) if user_events else None,
+            "last_event": _fmt_ts(user_events[-1].timestamp_ns) if user_events else None,
         }
 
     def get_insights(self) -> Dict[str, Any]:
@@ -274,18 +557,9 @@ class AdvancedAnalytics:
         if not self.events:
             return {}
 
-        event_counts = {}
-        for event in self.events:
-            event_type = event["type"]
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
-
         return {
             "total_events": len(self.events),
-            "unique_users": len(set(e["user_id"] for e in self.events)),
-            "event_distribution": event_counts,
-            "most_common_event": max(
-                event_counts.items(),
-                key=lambda x: x[1],
-                default=("unknown", 0)
-            )[0]
+            "unique_users": len(self._user_events),
+            "event_distribution": dict(self._type_counts),
+            "most_common_event": self._type_counts.most_common(1)[0][0],
         }
@@ -3,12 +3,16 @@ Task execution module for the AI agent.
 Handles executing tasks and interacting with the codebase.
 """
 
-from typing import Any, Dict, List
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+import asyncio
 import sys
 import os
 
 # Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from llm.base import LLM
 from agent.planner import Task
@@ -19,11 +23,20 @@ from repo.patcher import Patcher
 class Executor:
     """Executes tasks using the LLM and repository tools."""
     
-    def __init__(self, llm: LLM, repo_path: str):
+    # Kept as a string; each request gets its own message dict, so a provider
+    # that mutates the messages it is given cannot change later prompts
+    _SYSTEM_PROMPT = (
+        "You are a code-aware AI assistant. Help execute development tasks. "
+        "Be specific about file paths and code changes needed."
+    )
+    
+    def __init__(self, llm: LLM, repo_path: str, max_history: int = 10_000):
         self.llm = llm
         self.scanner = Scanner(repo_path)
         self.patcher = Patcher(repo_path)
-        self.execution_history: List[Dict[str, Any]] = []
+        # Bounded so long-running agents don't grow without limit
+        self.execution_history: Deque[Dict[str, Any]] = deque(maxlen=max_history)
+        self._repo_info_cache: Optional[Tuple[Any, str]] = None
     
     def execute_task(self, task: Task, context: str = "") -> str:
         """
@@ -36,31 +49,105 @@ class Executor:
         Returns:
             The result of task execution
         """
-        # Get repository information
-        repo_info = self.scanner.scan_repository()
+        messages = self._build_messages(task, context)
+        response = self.llm.completion(messages)
+        self._record(task, response)
+        return response
+    
+    async def execute_task_async(self, task: Task, context: str = "") -> str:
+        """
+        Execute a single task without blocking the event loop.
         
-        messages = [
-            {
-                "role": "system",
-                "content": "You are a code-aware AI assistant. Help execute development tasks. "
-                          "Be specific about file paths and code changes needed.",
-            },
+        The repository summary is built on the loop thread; only the LLM
+        call runs in a worker thread, so any provider can be awaited.
+        
+        Args:
+            task: The task to execute
+            context: Additional context about the codebase
+            
+        Returns:
+            The result of task execution
+        """
+        messages = self._build_messages(task, context)
+        response = await asyncio.to_thread(self.llm.completion, messages)
+        self._record(task, response)
+        return response
+    
+    async def execute_tasks_async(
+        self, tasks: List[Task], context: str = "", max_concurrency: int = 8
+    ) -> List[Union[str, BaseException]]:
+        """
+        Execute tasks concurrently, at most ``max_concurrency`` at a time.
+        
+        Tasks are dispatched in dependency levels: a task only starts once
+        every dependency that is part of this batch has finished.
+        
+        Args:
+            tasks: The tasks to execute
+            context: Additional context about the codebase
+            max_concurrency: Upper bound on in-flight LLM calls
+            
+        Returns:
+            Results in the same order as ``tasks``; a failed task yields its exception
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(task: Task) -> str:
+            async with semaphore:
+                return await self.execute_task_async(task, context)
+        
+        batch_ids = {task.id for task in tasks}
+        results: Dict[int, Union[str, BaseException]] = {}
+        pending = list(tasks)
+        while pending:
+            level = [
+                task for task in pending
+                if all(dep in results or dep not in batch_ids for dep in task.dependencies)
+            ]
+            if not level:
+                # Cyclic dependencies inside the batch; run what is left
+                level = pending
+            outcomes = await asyncio.gather(*(run(task) for task in level), return_exceptions=True)
+            for task, outcome in zip(level, outcomes):
+                results[task.id] = outcome
+            pending = [task for task in pending if task.id not in results]
+        
+        return [results[task.id] for task in tasks]
+    
+    def execute_tasks_batch(
+        self, tasks: List[Task], context: str = "", max_concurrent: int = 8
+    ) -> List[Union[str, BaseException]]:
+        """
+        Execute tasks concurrently from synchronous code.
+        
+        Args:
+            tasks: The tasks to execute
+            context: Additional context about the codebase
+            max_concurrent: Upper bound on in-flight LLM calls
+            
+        Returns:
+            Results in the same order as ``tasks``; a failed task yields its exception
+        """
+        return asyncio.run(self.execute_tasks_async(tasks, context, max_concurrent))
+    
+    def _build_messages(self, task: Task, context: str) -> List[Dict[str, str]]:
+        """Build the chat messages for a task."""
+        repo_info = self._get_repo_info()
+        return [
+            {"role": "system", "content": self._SYSTEM_PROMPT},
             {
                 "role": "user",
                 "content": f"Task: {task.description}\n\nRepository Context:\n{repo_info}\n\nAdditional Context:\n{context}",
             },
         ]
-        
-        response = self.llm.completion(messages)
-        
-        # Record execution
+    
+    def _record(self, task: Task, response: str):
+        """Record a finished execution."""
         self.execution_history.append({
             "task_id": task.id,
             "task_description": task.description,
             "response": response,
         })
-        
-        return response
     
     def apply_changes(self, file_path: str, changes: str) -> bool:
         """
@@ -78,11 +165,43 @@ class Executor:
         except Exception as e:
             print(f"Error applying changes: {e}")
             return False
+        finally:
+            self.invalidate_repo_cache()
+    
+    def try_apply_changes(self, file_path: str, changes: str) -> Tuple[bool, Optional[str]]:
+        """
+        Apply code changes to a file without raising.
+        
+        Args:
+            file_path: Path to the file to modify
+            changes: New file content
+            
+        Returns:
+            Tuple of (success, error message or None)
+        """
+        result = self.patcher.try_apply_patch(file_path, changes)
+        self.invalidate_repo_cache()
+        return result
+    
+    def _get_repo_info(self) -> str:
+        """Return the repository summary, rescanning only when the tree changed."""
+        # Stat-only walk; far cheaper than a scan, which also reads every file
+        stamp = self.scanner.tree_stamp()
+        if stamp is None:
+            return self.scanner.scan_repository()
+        
+        if self._repo_info_cache is None or self._repo_info_cache[0] != stamp:
+            self._repo_info_cache = (stamp, self.scanner.scan_repository())
+        return self._repo_info_cache[1]
+    
+    def invalidate_repo_cache(self):
+        """Force the next task to rescan the repository."""
+        self._repo_info_cache = None
     
     def get_execution_history(self) -> List[Dict[str, Any]]:
         """Get the history of executed tasks."""
-        return self.execution_history
+        return list(self.execution_history)
     
     def clear_history(self):
         """Clear execution history."""
-        self.execution_history = []
+        self.execution_history.clear()
@@ -3,17 +3,30 @@ Conversation history tracking for the AI agent.
 Manages messages and context across agent sessions.
 """
 
-from typing import List, Dict, Any
+from collections import Counter, deque
+from itertools import islice
+from typing import Deque, List, Dict, Any, Iterable, Tuple, Union
 from datetime import datetime
+import time
 
 
 class ConversationMessage:
     """Represents a single message in the conversation."""
     
-    def __init__(self, role: str, content: str, timestamp: datetime = None):
+    __slots__ = ("role", "content", "_timestamp")
+    
+    def __init__(self, role: str, content: str, timestamp: Union[datetime, int] = None):
         self.role = role  # "user", "assistant", "system"
         self.content = content
-        self.timestamp = timestamp or datetime.now()
+        # A datetime, or time.time_ns() until the timestamp is first read
+        self._timestamp = timestamp or time.time_ns()
+    
+    @property
+    def timestamp(self) -> datetime:
+        ts = self._timestamp
+        if isinstance(ts, int):
+            ts = self._timestamp = datetime.fromtimestamp(ts / 1e9)
+        return ts
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -27,18 +40,36 @@ class ConversationHistory:
     """Manages conversation history."""
     
     def __init__(self, max_messages: int = 100):
-        self.messages: List[ConversationMessage] = []
+        # Bounded deque: the oldest message drops off as a new one is appended
+        self.messages: Deque[ConversationMessage] = deque(maxlen=max_messages)
         self.max_messages = max_messages
         self.created_at = datetime.now()
+        # Messages per role, kept in step with the deque for get_summary
+        self._role_counts: Counter = Counter()
+    
+    def _append(self, message: ConversationMessage):
+        messages = self.messages
+        if len(messages) == messages.maxlen:
+            if not messages:
+                return
+            self._role_counts[messages[0].role] -= 1
+        messages.append(message)
+        self._role_counts[message.role] += 1
     
     def add_message(self, role: str, content: str):
         """Add a message to the history."""
-        message = ConversationMessage(role, content)
-        self.messages.append(message)
+        self._append(ConversationMessage(role, content))
+    
+    def extend(self, messages: Iterable[Tuple[str, str]]):
+        """
+        Add several messages at once.
         
-        # Keep only recent messages if exceeding limit
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages:]
+        Args:
+            messages: (role, content) pairs; all share one timestamp
+        """
+        timestamp = time.time_ns()
+        for role, content in messages:
+            self._append(ConversationMessage(role, content, timestamp))
     
     def get_messages(self, last_n: int = None) -> List[Dict[str, str]]:
         """
@@ -51,7 +82,7 @@ class ConversationHistory:
             List of messages formatted as {role, content}
         """
         if last_n:
-            messages = self.messages[-last_n:]
+            messages = islice(self.messages, max(len(self.messages) - last_n, 0), None)
         else:
             messages = self.messages
         
@@ -63,7 +94,8 @@ class ConversationHistory:
     
     def clear(self):
         """Clear all messages."""
-        self.messages = []
+        self.messages.clear()
+        self._role_counts.clear()
     
     def get_summary(self) -> Dict[str, Any]:
         """Get a summary of the conversation."""
@@ -71,6 +103,6 @@ class ConversationHistory:
             "total_messages": len(self.messages),
             "created_at": self.created_at.isoformat(),
             "last_message": self.messages[-1].to_dict() if self.messages else None,
-            "user_messages": sum(1 for m in self.messages if m.role == "user"),
-            "assistant_messages": sum(1 for m in self.messages if m.role == "assistant"),
+            "user_messages": self._role_counts["user"],
+            "assistant_messages": self._role_counts["assistant"],
         }
@@ -4,18 +4,48 @@ Handles breaking down goals into actionable tasks.
 """
 
 from typing import List, Dict, Any
+import heapq
+import re
 import sys
 import os
 
 # Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from llm.base import LLM
 
+# Matches list numbering such as "1.", "2)" or "10:" at the start of a line
+_NUM_PREFIX = re.compile(r"^\d+[.):]\s*")
+
+
+def parse_task_lines(response: str) -> List[str]:
+    """
+    Extract task descriptions from a numbered-list LLM response.
+    
+    Args:
+        response: Raw LLM output, one task per line
+        
+    Returns:
+        Task descriptions with list numbering removed, blank lines skipped
+    """
+    strip_number = _NUM_PREFIX.sub
+    descriptions = []
+    for line in response.splitlines():
+        line = line.strip()
+        if line:
+            line = strip_number("", line, count=1).strip()
+            if line:
+                descriptions.append(line)
+    return descriptions
+
 
 class Task:
     """Represents a single task in the plan."""
     
+    __slots__ = ("id", "description", "priority", "dependencies", "completed", "result")
+    
     def __init__(self, id: int, description: str, priority: int = 0, dependencies: List[int] = None):
         self.id = id
         self.description = description
@@ -40,8 +70,13 @@ class Planner:
     
     def __init__(self, llm: LLM):
         self.llm = llm
+        # Ids come from task_counter, so insertion order is id order
         self.tasks: Dict[int, Task] = {}
         self.task_counter = 0
+        # Ready queue: ids of tasks whose dependencies are all complete
+        self._ready: List[int] = []
+        self._rev_deps: Dict[int, List[int]] = {}
+        self._pending_deps: Dict[int, int] = {}
     
     def plan(self, goal: str) -> List[Task]:
         """
@@ -69,43 +104,49 @@ class Planner:
         tasks = self._parse_tasks(response)
         
         for task in tasks:
-            self.tasks[task.id] = task
+            self._add_task(task)
         
         return tasks
     
+    def _add_task(self, task: Task):
+        """Register a task and queue it if its dependencies are satisfied."""
+        self.tasks[task.id] = task
+        pending = 0
+        for dep_id in task.dependencies:
+            dep = self.tasks.get(dep_id)
+            if dep is None or not dep.completed:
+                self._rev_deps.setdefault(dep_id, []).append(task.id)
+                pending += 1
+        self._pending_deps[task.id] = pending
+        if pending == 0:
+            heapq.heappush(self._ready, task.id)
+    
     def _parse_tasks(self, response: str) -> List[Task]:
         """Parse task descriptions from LLM response."""
         tasks = []
-        lines = response.strip().split("\n")
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Remove numbering (e.g., "1.", "1)", etc.)
-            for i in range(10):
-                prefixes = [f"{i}.", f"{i})", f"{i}:"]
-                for prefix in prefixes:
-                    if line.startswith(prefix):
-                        line = line[len(prefix):].strip()
-                        break
-            
-            if line:
-                self.task_counter += 1
-                task = Task(
-                    id=self.task_counter,
-                    description=line,
-                    priority=len(tasks),
-                )
-                tasks.append(task)
+        for description in parse_task_lines(response):
+            self.task_counter += 1
+            task = Task(
+                id=self.task_counter,
+                description=description,
+                priority=len(tasks),
+            )
+            tasks.append(task)
         
         return tasks
     
     def get_next_task(self) -> Task:
         """Get the next unfinished task."""
-        for task_id in sorted(self.tasks.keys()):
-            task = self.tasks[task_id]
+        ready = self._ready
+        while ready:
+            task = self.tasks.get(ready[0])
+            if task is not None and not task.completed:
+                return task
+            heapq.heappop(ready)
+        
+        # Fall back to a full scan for tasks added outside of plan()
+        for task in self.tasks.values():
             if not task.completed:
                 # Check dependencies
                 if all(self.tasks[dep_id].completed for dep_id in task.dependencies):
@@ -117,12 +158,15 @@ class Planner:
         if task_id in self.tasks:
             self.tasks[task_id].completed = True
             self.tasks[task_id].result = result
+            for child_id in self._rev_deps.pop(task_id, ()):
+                self._pending_deps[child_id] -= 1
+                if self._pending_deps[child_id] == 0:
+                    heapq.heappush(self._ready, child_id)
     
     def get_plan_summary(self) -> str:
         """Get a summary of the current plan."""
-        summary = "Current Plan:\n"
-        for task_id in sorted(self.tasks.keys()):
-            task = self.tasks[task_id]
+        parts = ["Current Plan:\n"]
+        for task in self.tasks.values():
             status = "✓" if task.completed else "○"
-            summary += f"{status} [{task.id}] {task.description}\n"
-        return summary
+            parts.append(f"{status} [{task.id}] {task.description}\n")
+        return "".join(parts)
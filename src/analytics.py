@@ -3,47 +3,123 @@ Analytics engine for tracking and analyzing agent performance.
 Provides insights and metrics for optimization.
 """
 
-from typing import Dict, List, Any
+from typing import Deque, Dict, List, Any, NamedTuple
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
+import heapq
+import math
 import statistics
+import time
+
+
+class Execution(NamedTuple):
+    """One recorded task execution."""
+    timestamp_ns: int  # time.time_ns() when recorded
+    duration: float
+    success: bool
+    result_length: int
+
+
+class RunningStats:
+    """Count, mean, spread and range of a stream, updated in O(1) per value.
+    
+    Uses Welford's online algorithm, so no values are retained.
+    """
+    
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def add(self, value: float) -> None:
+        """Fold one value into the statistics."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation; 0 for fewer than two values."""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0
+    
+    def summary(self) -> Dict[str, Any]:
+        """Summary in the shape reported by MetricsCollector."""
+        return {
+            "avg": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count
+        }
+
+
+class TaskMetrics:
+    """Recent executions of one task plus running totals over all of them."""
+    
+    __slots__ = ("executions", "durations", "successes")
+    
+    def __init__(self, window: int):
+        self.executions: Deque[Execution] = deque(maxlen=window)
+        self.durations = RunningStats()
+        self.successes = 0
+    
+    def add(self, execution: Execution) -> None:
+        self.executions.append(execution)
+        self.durations.add(execution.duration)
+        if execution.success:
+            self.successes += 1
 
 
 class Analytics:
     """Tracks and analyzes agent performance metrics."""
     
-    def __init__(self, db_manager=None):
+    def __init__(self, db_manager=None, window: int = 10_000):
         self.db = db_manager
-        self.metrics = defaultdict(list)
+        # Per-task metrics keyed by task id; each keeps only its last
+        # `window` executions, while its statistics cover every execution
+        self.window = window
+        self.metrics: Dict[int, TaskMetrics] = {}
+        # Totals across all tasks, kept up to date for get_performance_report
+        self._durations = RunningStats()
+        self._successes = 0
     
     def record_execution(self, task_id: int, duration: float, success: bool, result_length: int = 0):
         """Record task execution metrics."""
-        self.metrics[f"task_{task_id}"].append({
-            "timestamp": datetime.now().isoformat(),
-            "duration": duration,
-            "success": success,
-            "result_length": result_length
-        })
+        task_metrics = self.metrics.get(task_id)
+        if task_metrics is None:
+            task_metrics = self.metrics[task_id] = TaskMetrics(self.window)
+        task_metrics.add(Execution(time.time_ns(), duration, success, result_length))
+        self._durations.add(duration)
+        if success:
+            self._successes += 1
     
     def get_execution_stats(self, task_id: int) -> Dict[str, Any]:
         """Get statistics for a specific task."""
-        executions = self.metrics.get(f"task_{task_id}", [])
+        task_metrics = self.metrics.get(task_id)
         
-        if not executions:
+        if task_metrics is None:
             return {"error": "No executions found"}
         
-        durations = [e["duration"] for e in executions]
-        successes = sum(1 for e in executions if e["success"])
+        durations = task_metrics.durations
+        successes = task_metrics.successes
         
         return {
-            "total_executions": len(executions),
+            "total_executions": durations.count,
             "successful": successes,
-            "failed": len(executions) - successes,
-            "success_rate": (successes / len(executions)) * 100,
-            "avg_duration": statistics.mean(durations),
-            "min_duration": min(durations),
-            "max_duration": max(durations),
-            "std_dev": statistics.stdev(durations) if len(durations) > 1 else 0
+            "failed": durations.count - successes,
+            "success_rate": (successes / durations.count) * 100,
+            "avg_duration": durations.mean,
+            "min_duration": durations.min,
+            "max_duration": durations.max,
+            "std_dev": durations.stdev
         }
     
     def get_plan_analytics(self, plan_id: int) -> Dict[str, Any]:
@@ -98,17 +174,10 @@ class Analytics:
     
     def get_trending_tasks(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get trending tasks based on execution count."""
-        task_counts = defaultdict(int)
-        
-        for metric_key, executions in self.metrics.items():
-            if metric_key.startswith("task_"):
-                task_id = metric_key.replace("task_", "")
-                task_counts[task_id] = len(executions)
-        
-        trending = sorted(task_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+        trending = heapq.nlargest(limit, self.metrics.items(), key=lambda x: x[1].durations.count)
         return [
-            {"task_id": int(task_id), "execution_count": count}
-            for task_id, count in trending
+            {"task_id": task_id, "execution_count": task_metrics.durations.count}
+            for task_id, task_metrics in trending
         ]
     
     def get_performance_report(self) -> Dict[str, Any]:
@@ -118,16 +187,9 @@ class Analytics:
         if total_metrics == 0:
             return {"status": "No data available"}
         
-        all_durations = []
-        total_successes = 0
-        total_executions = 0
-        
-        for executions in self.metrics.values():
-            for execution in executions:
-                all_durations.append(execution["duration"])
-                if execution["success"]:
-                    total_successes += 1
-                total_executions += 1
+        durations = self._durations
+        total_executions = durations.count
+        total_successes = self._successes
         
         return {
             "summary": {
@@ -138,17 +200,21 @@ class Analytics:
                 "success_rate": (total_successes / total_executions * 100) if total_executions > 0 else 0
             },
             "performance": {
-                "avg_execution_time": statistics.mean(all_durations) if all_durations else 0,
-                "min_execution_time": min(all_durations) if all_durations else 0,
-                "max_execution_time": max(all_durations) if all_durations else 0,
-                "std_dev": statistics.stdev(all_durations) if len(all_durations) > 1 else 0
+                "avg_execution_time": durations.mean,
+                "min_execution_time": durations.min,
+                "max_execution_time": durations.max,
+                "std_dev": durations.stdev
             },
             "generated_at": datetime.now().isoformat()
         }
 
 
 class MetricsCollector:
-    """Collects and aggregates metrics over time."""
+    """Collects and aggregates metrics over time.
+    
+    Each metric keeps running statistics per hour and per day rather
+    than the raw values.
+    """
     
     def __init__(self):
         self.hourly_metrics = defaultdict(dict)
@@ -159,20 +225,22 @@ class MetricsCollector:
         now = datetime.now()
         hour_key = now.strftime("%Y-%m-%d %H:00")
         
-        if metric_name not in self.hourly_metrics[hour_key]:
-            self.hourly_metrics[hour_key][metric_name] = []
+        stats = self.hourly_metrics[hour_key].get(metric_name)
+        if stats is None:
+            stats = self.hourly_metrics[hour_key][metric_name] = RunningStats()
         
-        self.hourly_metrics[hour_key][metric_name].append(value)
+        stats.add(value)
     
     def record_daily_metric(self, metric_name: str, value: float):
         """Record a daily metric."""
         now = datetime.now()
         day_key = now.strftime("%Y-%m-%d")
         
-        if metric_name not in self.daily_metrics[day_key]:
-            self.daily_metrics[day_key][metric_name] = []
+        stats = self.daily_metrics[day_key].get(metric_name)
+        if stats is None:
+            stats = self.daily_metrics[day_key][metric_name] = RunningStats()
         
-        self.daily_metrics[day_key][metric_name].append(value)
+        stats.add(value)
     
     def get_hourly_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get hourly metrics summary for the last N hours."""
@@ -185,13 +253,8 @@ class MetricsCollector:
             
             if hour_key in self.hourly_metrics:
                 summary[hour_key] = {}
-                for metric, values in self.hourly_metrics[hour_key].items():
-                    summary[hour_key][metric] = {
-                        "avg": statistics.mean(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "count": len(values)
-                    }
+                for metric, stats in self.hourly_metrics[hour_key].items():
+                    summary[hour_key][metric] = stats.summary()
         
         return summary
     
@@ -206,13 +269,8 @@ class MetricsCollector:
             
             if day_key in self.daily_metrics:
                 summary[day_key] = {}
-                for metric, values in self.daily_metrics[day_key].items():
-                    summary[day_key][metric] = {
-                        "avg": statistics.mean(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "count": len(values)
-                    }
+                for metric, stats in self.daily_metrics[day_key].items():
+                    summary[day_key][metric] = stats.summary()
         
         return summary
 
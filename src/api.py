@@ -6,6 +6,7 @@ Includes Phase 3 features: WebSocket, Authentication, Templates, Analytics.
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, WebSocket, WebSocketDisconnect, Header
 from fastapi.security import HTTPBearer
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 import logging
@@ -15,7 +16,9 @@ import sys
 import os
 
 # Add current directory to path to allow relative imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from config import load_config_and_llm
 from agent.planner import Planner
@@ -138,11 +141,20 @@ class AnalyticsResponse(BaseModel):
     total_results_length: int
 
 
+# orjson encodes responses several times faster than the stdlib json module;
+# without it, fall back to FastAPI's default response class
+try:
+    import orjson  # noqa: F401
+    _ResponseClass = ORJSONResponse
+except ImportError:
+    _ResponseClass = JSONResponse
+
 # Initialize app
 app = FastAPI(
     title="AI Agent API",
     description="REST API for the AI Agent framework",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=_ResponseClass
 )
 
 # Add API key authentication middleware
@@ -171,7 +183,7 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "llm_provider": config.get("llm", {}).get("provider"),
+        "llm_provider": config.llm.provider,
         "version": "0.2.0"
     }
 
@@ -233,7 +245,7 @@ async def execute_task(plan_id: int, request: TaskExecutionRequest, background_t
                 history.add_message("assistant", result)
                 
                 # Save to database
-                db_manager.save_execution(request.task_id, result)
+                db_manager.save_execution(session["task_db_ids"][request.task_id], result)
             except Exception as e:
                 logger.error(f"Error executing task: {e}")
         
@@ -289,11 +301,8 @@ async def add_message(message: ConversationMessage):
 async def scan_repository(repo_path: str = "."):
     """Scan a repository."""
     try:
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
         from repo.scanner import Scanner
-        scanner = Scanner(repo_path)
+        scanner = Scanner(repo_path, use_cache=True)
         info = scanner.scan_repository()
         return {"repository": repo_path, "info": info}
     except Exception as e:
@@ -305,19 +314,12 @@ async def scan_repository(repo_path: str = "."):
 async def get_statistics():
     """Get overall statistics."""
     try:
-        plans = db_manager.get_all_plans(limit=1000)
-        conversations = db_manager.get_conversation_history(limit=1000)
-        
-        total_plans = len(plans)
-        completed_plans = sum(1 for p in plans if p["status"] == "completed")
-        total_messages = len(conversations)
-        
         return {
-            "total_plans": total_plans,
-            "completed_plans": completed_plans,
+            "total_plans": db_manager.count_plans(),
+            "completed_plans": db_manager.count_plans(status="completed"),
             "active_sessions": len(active_sessions),
-            "total_messages": total_messages,
-            "llm_provider": config.get("llm", {}).get("provider"),
+            "total_messages": db_manager.count_messages(),
+            "llm_provider": config.llm.provider,
         }
     except Exception as e:
         logger.error(f"Error getting statistics: {e}")
@@ -609,8 +611,11 @@ async def create_plan(
         # Save to database
         plan_id = db_manager.save_plan(request.goal)
         
-        for task in tasks:
-            db_manager.save_task(plan_id, task.id, task.description, task.priority)
+        # Planner task id -> tasks row id, for linking executions
+        task_db_ids = dict(zip(
+            (task.id for task in tasks),
+            db_manager.save_tasks_bulk(plan_id, tasks),
+        ))
         
         # Store session
         global session_counter
@@ -619,6 +624,7 @@ async def create_plan(
             "planner": planner,
             "executor": Executor(llm, request.repo_path),
             "history": ConversationHistory(),
+            "task_db_ids": task_db_ids,
             "repo_path": request.repo_path,
             "user_id": current_user.user_id,
         }
@@ -8,9 +8,11 @@ import sys
 import os
 from pathlib import Path
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
-from config import load_config_and_llm
+from config import AgentConfig, load_config_and_llm
 from agent.planner import Planner
 from agent.executor import Executor
 from agent.history import ConversationHistory
@@ -218,7 +220,7 @@ def main() -> None:
     
     # Load configuration
     try:
-        config: Dict[str, Any]
+        config: AgentConfig
         llm: Any
         config, llm = load_config_and_llm(args.config)
     except FileNotFoundError:
@@ -243,7 +245,7 @@ def main() -> None:
     if args.verbose:
         print(f"Configuration: {args.config}")
         print(f"Repository: {repo_path}")
-        print(f"LLM Provider: {config.get('llm', {}).get('provider')}")
+        print(f"LLM Provider: {config.llm.provider}")
     
     # Execute commands
     try:
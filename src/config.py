@@ -1,9 +1,20 @@
+import inspect
 import yaml
 import sys
 import os
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# libyaml's C loader is much faster; PyYAML builds without it fall back to pure Python
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 
 # Add current directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from llm.base import LLM
 from llm.ollama import Ollama
@@ -11,34 +22,130 @@ from llm.openai_like import OpenAILike
 from llm.mock import MockLLM
 
 
-def load_config_and_llm(config_file: str = "agent.config.yaml") -> tuple[dict, LLM]:
+@dataclass(frozen=True)
+class LLMSection:
+    """The ``llm`` section of the config file."""
+
+    __slots__ = ("provider", "model", "api_base", "api_key", "temperature", "top_p")
+
+    provider: Optional[str]
+    model: Optional[str]
+    api_base: Optional[str]
+    api_key: Optional[str]
+    temperature: float
+    top_p: float
+
+
+@dataclass(frozen=True)
+class AgentConfig:
     """
-    Load the configuration from the given file and initialize the LLM.
+    Parsed config file. ``raw`` holds the full YAML mapping for sections
+    without a typed view; it is shared and must not be mutated.
     """
-    with open(config_file, "r") as f:
-        config = yaml.safe_load(f)
 
-    llm_config = config.get("llm", {})
-    provider = llm_config.get("provider")
+    __slots__ = ("llm", "raw")
 
-    if provider == "ollama":
-        llm = Ollama(
-            model=llm_config.get("model"),
-            api_base=llm_config.get("api_base"),
-            temperature=llm_config.get("temperature", 0.0),
-            top_p=llm_config.get("top_p", 1.0),
-        )
-    elif provider == "openai_like":
-        llm = OpenAILike(
-            model=llm_config.get("model"),
-            api_base=llm_config.get("api_base"),
-            api_key=llm_config.get("api_key"),
-            temperature=llm_config.get("temperature", 0.0),
-            top_p=llm_config.get("top_p", 1.0),
+    llm: LLMSection
+    raw: dict
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "AgentConfig":
+        data = data or {}
+        llm = data.get("llm") or {}
+        return cls(
+            llm=LLMSection(
+                provider=llm.get("provider"),
+                model=llm.get("model"),
+                api_base=llm.get("api_base"),
+                api_key=llm.get("api_key"),
+                temperature=llm.get("temperature", 0.0),
+                top_p=llm.get("top_p", 1.0),
+            ),
+            raw=data,
         )
-    elif provider == "mock":
-        llm = MockLLM()
-    else:
+
+    def get(self, section: str, default: Any = None) -> Any:
+        """Return a raw config section, like dict.get."""
+        return self.raw.get(section, default)
+
+
+# LLM classes by the provider name used in the config file
+_PROVIDERS: dict[str, type] = {
+    "ollama": Ollama,
+    "openai_like": OpenAILike,
+    "mock": MockLLM,
+}
+
+# Constructor arguments each provider accepts, resolved once at import
+_PROVIDER_ARGS: dict[str, frozenset] = {
+    name: frozenset(inspect.signature(cls).parameters) for name, cls in _PROVIDERS.items()
+}
+
+# Parsed config files keyed by absolute path: (st_mtime_ns, config)
+_CONFIG_CACHE: dict[str, tuple[int, AgentConfig]] = {}
+
+# LLM instances keyed by the settings they were built from
+_LLM_CACHE: dict[tuple, LLM] = {}
+
+
+def _load_config(config_file: str) -> AgentConfig:
+    """
+    Parse a YAML config file, reusing the previous result while its mtime is unchanged.
+    """
+    path = os.path.abspath(config_file)
+    mtime = os.stat(path).st_mtime_ns
+
+    cached = _CONFIG_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r") as f:
+        config = AgentConfig.from_dict(yaml.load(f, Loader=_Loader))
+
+    _CONFIG_CACHE[path] = (mtime, config)
+    return config
+
+
+def load_config_and_llm(config_file: str = "agent.config.yaml") -> tuple[AgentConfig, LLM]:
+    """
+    Load the configuration from the given file and initialize the LLM.
+    """
+    config = _load_config(config_file)
+
+    llm_config = config.llm
+    provider = llm_config.provider
+    settings = {
+        "model": llm_config.model,
+        "api_base": llm_config.api_base,
+        "api_key": llm_config.api_key,
+        "temperature": llm_config.temperature,
+        "top_p": llm_config.top_p,
+    }
+
+    key = (provider, *settings.values())
+    llm = _LLM_CACHE.get(key)
+    if llm is not None:
+        return config, llm
+
+    if provider is None or provider not in _PROVIDERS:
         raise ValueError(f"Unsupported LLM provider: {provider}")
+    cls = _PROVIDERS[provider]
+    accepted = _PROVIDER_ARGS[provider]
+    llm = cls(**{name: value for name, value in settings.items() if name in accepted})
+
+    _LLM_CACHE[key] = llm
+    return config, llm
+
 
+def warmup(config_file: str = "agent.config.yaml") -> tuple[AgentConfig, LLM]:
+    """
+    Load the config and LLM up front and open the provider connection, so
+    later load_config_and_llm calls and the first completion start warm.
+    """
+    config, llm = load_config_and_llm(config_file)
+    try:
+        llm.warmup()
+    except Exception:
+        # Best effort; the first real completion reports connection problems
+        pass
     return config, llm
@@ -3,76 +3,97 @@ Examples demonstrating the AI Agent framework.
 Shows how to use different components programmatically.
 """
 
+import logging
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from functools import partial
+from typing import Callable, List, Tuple
 
-from config import load_config_and_llm
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+from config import load_config_and_llm, warmup
 from agent.planner import Planner
 from agent.executor import Executor
 from agent.history import ConversationHistory
 from persistence import DatabaseManager, PersistentPlanner
 from repo.scanner import Scanner
 
+logger = logging.getLogger(__name__)
+
+_BANNER = "=" * 60
+_RULE = "=" * 40
+
+# Directories the example scans skip
+_IGNORE_DIRS = Scanner.DEFAULT_IGNORE_DIRS
 
-def example_1_basic_planning():
+
+def example_1_basic_planning(llm=None):
     """Example 1: Basic planning without persistence."""
-    print("\n" + "=" * 60)
-    print("Example 1: Basic Planning")
-    print("=" * 60)
+    logger.info("\n%s", _BANNER)
+    logger.info("Example 1: Basic Planning")
+    logger.info(_BANNER)
     
     # Load configuration
-    config, llm = load_config_and_llm()
+    if llm is None:
+        config, llm = load_config_and_llm()
     
     # Create planner
     planner = Planner(llm)
     
     # Plan a goal
     goal = "Build a Python CLI tool for file management"
-    print(f"\nGoal: {goal}")
+    logger.info("\nGoal: %s", goal)
     
     tasks = planner.plan(goal)
-    print(f"\nGenerated {len(tasks)} tasks:")
+    logger.info("\nGenerated %s tasks:", len(tasks))
     for task in tasks:
-        print(f"  [{task.id}] {task.description}")
+        logger.info("  [%s] %s", task.id, task.description)
     
     # Display plan summary
-    print("\n" + planner.get_plan_summary())
+    logger.info("\n%s", planner.get_plan_summary())
 
 
-def example_2_planning_with_execution():
+def example_2_planning_with_execution(llm=None, executor=None):
     """Example 2: Planning and executing tasks."""
-    print("\n" + "=" * 60)
-    print("Example 2: Planning and Execution")
-    print("=" * 60)
+    logger.info("\n%s", _BANNER)
+    logger.info("Example 2: Planning and Execution")
+    logger.info(_BANNER)
     
-    config, llm = load_config_and_llm()
+    if llm is None:
+        config, llm = load_config_and_llm()
     
     planner = Planner(llm)
-    executor = Executor(llm, ".")
+    if executor is None:
+        executor = Executor(llm, ".")
     
     goal = "Create a web scraper"
-    print(f"\nGoal: {goal}")
+    logger.info("\nGoal: %s", goal)
     
     # Plan
     tasks = planner.plan(goal)
-    print(f"Created {len(tasks)} tasks")
-    
-    # Execute first 3 tasks
-    for i, task in enumerate(tasks[:3]):
-        print(f"\nExecuting task {i+1}: {task.description}")
-        result = executor.execute_task(task)
+    logger.info("Created %s tasks", len(tasks))
+    
+    # Execute first 3 tasks concurrently
+    results = executor.execute_tasks_batch(tasks[:3])
+    for i, (task, result) in enumerate(zip(tasks, results)):
+        logger.info("\nExecuted task %s: %s", i + 1, task.description)
+        if isinstance(result, Exception):
+            logger.error("Failed: %s", result)
+            continue
         planner.mark_task_complete(task.id, result)
-        print(f"Result: {result[:80]}...")
+        logger.info("Result: %s...", result[:80])
 
 
-def example_3_conversation_tracking():
+def example_3_conversation_tracking(llm=None):
     """Example 3: Tracking conversation history."""
-    print("\n" + "=" * 60)
-    print("Example 3: Conversation History")
-    print("=" * 60)
+    logger.info("\n%s", _BANNER)
+    logger.info("Example 3: Conversation History")
+    logger.info(_BANNER)
     
-    config, llm = load_config_and_llm()
+    if llm is None:
+        config, llm = load_config_and_llm()
     
     planner = Planner(llm)
     history = ConversationHistory()
@@ -84,178 +105,215 @@ def example_3_conversation_tracking():
         "How do we validate the models?",
     ]
     
+    # One growing message list: earlier turns form a stable prefix that
+    # providers with prompt caching can reuse instead of re-processing
+    messages = [
+        {"role": "system", "content": "You are a helpful project planning assistant."},
+    ]
+    
     for msg in user_messages:
-        print(f"\nUser: {msg}")
+        logger.info("\nUser: %s", msg)
         history.add_message("user", msg)
+        messages.append({"role": "user", "content": msg})
         
         # Get response from LLM
-        response = llm.completion([{"role": "user", "content": msg}])
-        print(f"Assistant: {response[:100]}...")
+        response = llm.completion(messages)
+        messages.append({"role": "assistant", "content": response})
+        logger.info("Assistant: %s...", response[:100])
         history.add_message("assistant", response)
     
     # Show summary
     summary = history.get_summary()
-    print("\n" + "=" * 40)
-    print("Conversation Summary:")
-    print(f"  Total messages: {summary['total_messages']}")
-    print(f"  User messages: {summary['user_messages']}")
-    print(f"  Assistant messages: {summary['assistant_messages']}")
+    logger.info("\n%s", _RULE)
+    logger.info("Conversation Summary:")
+    logger.info("  Total messages: %s", summary["total_messages"])
+    logger.info("  User messages: %s", summary["user_messages"])
+    logger.info("  Assistant messages: %s", summary["assistant_messages"])
 
 
-def example_4_repository_scanning():
+def example_4_repository_scanning(scanner=None):
     """Example 4: Scanning and analyzing repositories."""
-    print("\n" + "=" * 60)
-    print("Example 4: Repository Scanning")
-    print("=" * 60)
+    logger.info("\n%s", _BANNER)
+    logger.info("Example 4: Repository Scanning")
+    logger.info(_BANNER)
     
-    scanner = Scanner(".", ignore_dirs=[".git", "__pycache__", ".egg-info"])
+    if scanner is None:
+        scanner = Scanner(".", ignore_dirs=_IGNORE_DIRS)
     
-    print("\nScanning current repository...")
+    logger.info("\nScanning current repository...")
     info = scanner.scan_repository(max_depth=3)
-    print(info)
+    logger.info("%s", info)
     
     # Get Python files
     py_files = scanner.get_files_by_extension(".py")
-    print(f"\nPython files found: {len(py_files)}")
+    logger.info("\nPython files found: %s", len(py_files))
     for f in py_files[:5]:
-        print(f"  - {f}")
+        logger.info("  - %s", f)
 
 
 def example_5_persistence():
     """Example 5: Using persistence layer."""
-    print("\n" + "=" * 60)
-    print("Example 5: Database Persistence")
-    print("=" * 60)
+    logger.info("\n%s", _BANNER)
+    logger.info("Example 5: Database Persistence")
+    logger.info(_BANNER)
     
     # Create in-memory database for demo
     db = DatabaseManager(":memory:")
     
-    # Save a plan
-    print("\nSaving plan...")
-    plan_id = db.save_plan("Create an API server")
-    print(f"Plan ID: {plan_id}")
-    
-    # Save tasks
-    print("Saving tasks...")
-    task1_id = db.save_task(plan_id, 1, "Set up FastAPI project", 0)
-    task2_id = db.save_task(plan_id, 2, "Implement endpoints", 1)
-    
-    # Mark task as complete
-    print("Marking task as complete...")
-    db.update_task(task1_id, True, "Project set up successfully")
-    
-    # Save conversation
-    print("Saving conversation...")
-    db.save_conversation("user", "Plan an API server")
-    db.save_conversation("assistant", "I'll help you plan an API server...")
+    # All writes below commit together
+    with db.transaction():
+        # Save a plan
+        logger.info("\nSaving plan...")
+        plan_id = db.save_plan("Create an API server")
+        logger.info("Plan ID: %s", plan_id)
+        
+        # Save tasks
+        logger.info("Saving tasks...")
+        task1_id = db.save_task(plan_id, 1, "Set up FastAPI project", 0)
+        task2_id = db.save_task(plan_id, 2, "Implement endpoints", 1)
+        
+        # Mark task as complete
+        logger.info("Marking task as complete...")
+        db.update_task(task1_id, True, "Project set up successfully")
+        
+        # Save conversation
+        logger.info("Saving conversation...")
+        db.save_conversation("user", "Plan an API server")
+        db.save_conversation("assistant", "I'll help you plan an API server...")
     
     # Get statistics
-    print("\nPlan Statistics:")
     stats = db.get_plan_statistics(plan_id)
-    print(f"  Total tasks: {stats['total_tasks']}")
-    print(f"  Completed tasks: {stats['completed_tasks']}")
-    print(f"  Total executions: {stats['total_executions']}")
     
     # Get conversation history
-    print("\nConversation History:")
     messages = db.get_conversation_history(10)
-    for msg in messages:
-        print(f"  {msg['role']}: {msg['content'][:50]}...")
+    
+    # Report both in one write
+    report_lines = [
+        "\nPlan Statistics:",
+        "  Total tasks: %s" % stats["total_tasks"],
+        "  Completed tasks: %s" % stats["completed_tasks"],
+        "  Total executions: %s" % stats["total_executions"],
+        "\nConversation History:",
+    ]
+    report_lines.extend("  %s: %s..." % (msg["role"], msg["content"][:50]) for msg in messages)
+    logger.info("\n".join(report_lines))
     
     db.close()
 
 
-def example_6_end_to_end():
+def example_6_end_to_end(llm=None, executor=None, scanner=None):
     """Example 6: Complete end-to-end workflow."""
-    print("\n" + "=" * 60)
-    print("Example 6: End-to-End Workflow")
-    print("=" * 60)
+    logger.info("\n%s", _BANNER)
+    logger.info("Example 6: End-to-End Workflow")
+    logger.info(_BANNER)
     
-    config, llm = load_config_and_llm()
+    if llm is None:
+        config, llm = load_config_and_llm()
     
     # Initialize components
     db = DatabaseManager(":memory:")
     planner = Planner(llm)
-    executor = Executor(llm, ".")
+    if executor is None:
+        executor = Executor(llm, ".")
     history = ConversationHistory()
     
     # User starts with a goal
     goal = "Implement a data validation system"
-    print(f"\nGoal: {goal}")
+    logger.info("\nGoal: %s", goal)
     
     # Add to history
     history.add_message("user", goal)
     
     # Scan repository
-    print("\n1. Scanning repository...")
-    scanner = Scanner(".")
+    logger.info("\n1. Scanning repository...")
+    if scanner is None:
+        scanner = Scanner(".", ignore_dirs=_IGNORE_DIRS)
     repo_info = scanner.scan_repository()
-    print("   Repository scanned")
+    logger.info("   Repository scanned")
     
     # Create plan
-    print("\n2. Creating plan...")
-    db_plan_id = db.save_plan(goal)
+    logger.info("\n2. Creating plan...")
     tasks = planner.plan(goal)
     
-    for task in tasks:
-        db.save_task(db_plan_id, task.id, task.description, task.priority)
+    with db.transaction():
+        db_plan_id = db.save_plan(goal)
+        task_db_ids = dict(zip((task.id for task in tasks), db.save_tasks_bulk(db_plan_id, tasks)))
     
-    print(f"   Created {len(tasks)} tasks")
+    logger.info("   Created %s tasks", len(tasks))
     history.add_message("assistant", planner.get_plan_summary())
     
     # Execute tasks
-    print("\n3. Executing tasks...")
+    logger.info("\n3. Executing tasks...")
+    executed = []
     for i, task in enumerate(tasks[:2]):
         result = executor.execute_task(task)
         planner.mark_task_complete(task.id, result)
-        db.save_execution(task.id, result)
-        print(f"   Task {i+1} completed")
+        executed.append((task, result))
+        logger.info("   Task %s completed", i + 1)
         history.add_message("user", f"Execute task {task.id}")
         history.add_message("assistant", result)
     
+    # Record the results afterwards, so no transaction is held open across LLM calls
+    with db.transaction():
+        for task, result in executed:
+            db.save_execution(task_db_ids[task.id], result)
+    
     # Show final state
-    print("\n4. Final State:")
     stats = db.get_plan_statistics(db_plan_id)
     history_summary = history.get_summary()
     
-    print(f"   Tasks completed: {stats['completed_tasks']}/{stats['total_tasks']}")
-    print(f"   Conversation messages: {history_summary['total_messages']}")
-    print(f"   Total executions: {stats['total_executions']}")
+    logger.info(
+        "\n4. Final State:\n   Tasks completed: %s/%s\n   Conversation messages: %s\n   Total executions: %s",
+        stats["completed_tasks"],
+        stats["total_tasks"],
+        history_summary["total_messages"],
+        stats["total_executions"],
+    )
     
     db.close()
 
 
 def main():
     """Run all examples."""
-    print("\n" + "=" * 60)
-    print("AI Agent Framework - Examples")
-    print("=" * 60)
-    
-    examples = [
-        ("Basic Planning", example_1_basic_planning),
-        ("Planning with Execution", example_2_planning_with_execution),
-        ("Conversation Tracking", example_3_conversation_tracking),
-        ("Repository Scanning", example_4_repository_scanning),
+    logger.info("\n%s", _BANNER)
+    logger.info("AI Agent Framework - Examples")
+    logger.info(_BANNER)
+    
+    # Build shared components once instead of once per example
+    config, llm = warmup()
+    executor = Executor(llm, ".")
+    scanner = Scanner(".", ignore_dirs=_IGNORE_DIRS)
+    
+    examples: List[Tuple[str, Callable[[], None]]] = [
+        ("Basic Planning", partial(example_1_basic_planning, llm)),
+        ("Planning with Execution", partial(example_2_planning_with_execution, llm, executor)),
+        ("Conversation Tracking", partial(example_3_conversation_tracking, llm)),
+        ("Repository Scanning", partial(example_4_repository_scanning, scanner)),
         ("Database Persistence", example_5_persistence),
-        ("End-to-End Workflow", example_6_end_to_end),
+        ("End-to-End Workflow", partial(example_6_end_to_end, llm, executor, scanner)),
     ]
     
-    print("\nAvailable examples:")
+    logger.info("\nAvailable examples:")
     for i, (name, _) in enumerate(examples, 1):
-        print(f"  {i}. {name}")
+        logger.info("  %s. %s", i, name)
     
-    print("\nRunning all examples...\n")
+    logger.info("\nRunning all examples...\n")
     
     for name, example_func in examples:
         try:
             example_func()
         except Exception as e:
-            print(f"\nError in {name}: {e}")
+            logger.error("\nError in %s: %s", name, e)
     
-    print("\n" + "=" * 60)
-    print("All examples completed!")
-    print("=" * 60)
+    logger.info("\n%s", _BANNER)
+    logger.info("All examples completed!")
+    logger.info(_BANNER)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.environ.get("AGENT_LOG_LEVEL", "INFO").upper(),
+        format="%(message)s",
+        stream=sys.stdout,
+    )
     main()
@@ -3,7 +3,14 @@ from typing import List, Dict
 
 
 class LLM(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def completion(self, messages: List[Dict[str, str]]) -> str:
         pass
 
+    def warmup(self) -> None:
+        """
+        Open connections ahead of the first completion. No-op by default.
+        """
+
@@ -0,0 +1,53 @@
+"""
+Response cache for deterministic LLM completions.
+Avoids repeating identical requests when sampling is disabled.
+"""
+
+import sys
+import os
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
+
+import hashlib
+import json
+from typing import Any, List, Dict, Optional
+
+from caching import MemoryCache
+
+
+class LLMCache:
+    """Caches completions keyed on model, messages and sampling settings."""
+
+    def __init__(self, backend: Any = None):
+        """
+        Initialize the LLM cache.
+
+        Args:
+            backend: Object with get(key) and set(key, value), such as
+                MemoryCache, PersistentCache or diskcache.Cache.
+                Defaults to an in-memory cache.
+        """
+        self.backend = backend if backend is not None else MemoryCache()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        top_p: float,
+    ) -> str:
+        """Build a stable cache key for a completion request."""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "top_p": top_p},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached completion."""
+        return self.backend.get(key)
+
+    def set(self, key: str, content: str) -> None:
+        """Store a completion."""
+        self.backend.set(key, content)
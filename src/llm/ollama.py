@@ -1,6 +1,8 @@
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 import requests
 from typing import List, Dict, Any
@@ -9,6 +11,8 @@ from llm.base import LLM
 
 
 class Ollama(LLM):
+    __slots__ = ("model", "api_base", "temperature", "top_p")
+
     def __init__(self, model: str, api_base: str, temperature: float = 0.0, top_p: float = 1.0):
         self.model = model
         self.api_base = api_base
@@ -1,35 +1,74 @@
 import sys
 import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 import openai
 
 from llm.base import LLM
+from llm.cache import LLMCache
 
 
 class OpenAILike(LLM):
-    def __init__(self, model: str, api_base: str, api_key: str, temperature: float = 0.0, top_p: float = 1.0):
+    __slots__ = ("model", "api_base", "api_key", "temperature", "top_p", "_client", "cache")
+
+    def __init__(
+        self,
+        model: str,
+        api_base: str,
+        api_key: str,
+        temperature: float = 0.0,
+        top_p: float = 1.0,
+        cache: Optional[LLMCache] = None,
+    ):
         self.model = model
         self.api_base = api_base
-        self.api_key = api_key
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         self.temperature = temperature
         self.top_p = top_p
-        if not self.api_key:
-            # get from env
-            self.api_key = os.environ.get("OPENAI_API_KEY")
+        self._client: Optional[openai.OpenAI] = None
+        # Only deterministic (temperature 0) completions are cached
+        self.cache = cache if cache is not None else LLMCache()
+
+    @property
+    def client(self) -> openai.OpenAI:
+        """
+        Shared API client, created on first use so its connection pool is
+        reused across completions.
+        """
+        if self._client is None:
+            self._client = openai.OpenAI(api_key=self.api_key, base_url=self.api_base)
+        return self._client
+
+    def warmup(self) -> None:
+        """
+        Build the client and make one cheap request so the connection is
+        established before the first completion.
+        """
+        self.client.models.list()
 
     def completion(self, messages: List[Dict[str, str]], **kwargs: Any) -> str:
         """
         Generate a completion using the OpenAI-like API.
         """
-        client = openai.OpenAI(api_key=self.api_key, base_url=self.api_base)
-        response = client.chat.completions.create(
+        key = None
+        if self.temperature == 0:
+            key = LLMCache.make_key(self.model, messages, self.temperature, self.top_p)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = self.client.chat.completions.create(
             model=self.model,
             messages=messages,
             temperature=self.temperature,
             top_p=self.top_p,
         )
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
 
+        if key is not None and content is not None:
+            self.cache.set(key, content)
+        return content
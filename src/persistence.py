@@ -3,27 +3,107 @@ Persistence layer for storing plans, executions, and conversations.
 Uses SQLite for lightweight, portable storage.
 """
 
+import os
+import time
+import queue
 import sqlite3
 import json
+import threading
+import itertools
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
 from pathlib import Path
 
+try:
+    from agent.planner import Planner
+except ImportError:
+    from .agent.planner import Planner
+
+# Connection tuning applied on every open. With WAL and synchronous=NORMAL a
+# commit no longer fsyncs; a crash may lose the last committed transactions
+# but cannot corrupt the database.
+_PRAGMAS = """
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    PRAGMA busy_timeout=5000;
+    PRAGMA foreign_keys=ON;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Only meaningful for file-backed databases
+_FILE_PRAGMAS = "PRAGMA journal_mode=WAL;"
+
+# Write statements, kept as constants so the connection's statement cache
+# reuses their compiled form
+_INSERT_PLAN = "INSERT INTO plans (goal) VALUES (?)"
+_INSERT_TASK = "INSERT INTO tasks (plan_id, task_id, description, priority) VALUES (?, ?, ?, ?)"
+_UPDATE_TASK = "UPDATE tasks SET completed = ?, result = ? WHERE id = ?"
+_INSERT_EXECUTION = "INSERT INTO executions (task_id, response, duration_seconds) VALUES (?, ?, ?)"
+_INSERT_CONVERSATION = "INSERT INTO conversations (id, role, content) VALUES (?, ?, ?)"
+
+# Read statements select these columns explicitly; rows come back as tuples
+# and are zipped with the names, which skips sqlite3.Row's per-row key lookup
+_PLAN_COLS = ("id", "goal", "created_at", "status")
+_TASK_COLS = ("id", "plan_id", "task_id", "description", "priority", "completed", "result", "created_at")
+_CONVERSATION_COLS = ("role", "content", "created_at")
+_SELECT_PLAN = f"SELECT {', '.join(_PLAN_COLS)} FROM plans WHERE id = ?"
+_SELECT_PLAN_TASKS = f"SELECT {', '.join(_TASK_COLS)} FROM tasks WHERE plan_id = ? ORDER BY priority"
+_SELECT_RECENT_PLANS = f"SELECT {', '.join(_PLAN_COLS)} FROM plans ORDER BY created_at DESC LIMIT ?"
+_SELECT_CONVERSATION = (
+    f"SELECT {', '.join(_CONVERSATION_COLS)} FROM conversations ORDER BY created_at DESC, id DESC LIMIT ?"
+)
+_COUNT_PLANS = "SELECT COUNT(*) FROM plans"
+_COUNT_PLANS_BY_STATUS = "SELECT COUNT(*) FROM plans WHERE status = ?"
+_COUNT_CONVERSATION = "SELECT COUNT(*) FROM conversations"
+
 
 class DatabaseManager:
     """Manages persistence of agent data."""
     
-    def __init__(self, db_path: str = "agent.db"):
+    def __init__(self, db_path: str = "agent.db", autocommit: bool = True, readers: Optional[int] = None):
         self.db_path = db_path
+        # The single writer connection; reads use the reader pool when there is one
         self.conn = None
+        # When False, writes outside transaction() stay pending until commit()
+        self.autocommit = autocommit
+        # Depth of open transaction() blocks
+        self._tx_depth = 0
+        # Thread that opened the current write transaction; its reads go to
+        # self.conn so they see its own uncommitted writes
+        self._tx_owner: Optional[int] = None
+        self._write_lock = threading.RLock()
+        # conversations is a WITHOUT ROWID table, so message ids are assigned
+        # here; seeding from the clock keeps them increasing across restarts
+        self._conversation_ids = itertools.count(time.time_ns())
+        # Read-only connections, opened on demand up to _max_readers. An
+        # in-memory database is private to its connection, so it has no pool.
+        self._read_pool: Optional["queue.Queue[sqlite3.Connection]"] = None
+        self._max_readers = readers or os.cpu_count() or 4
+        self._readers_open = 0
+        # Every reader opened, borrowed or not, so close() can close them all
+        self._readers: List[sqlite3.Connection] = []
+        # Guards the reader bookkeeping only, so growing the pool never waits on a writer
+        self._pool_lock = threading.Lock()
         self.init_database()
+        if db_path not in (":memory:", ""):
+            self._read_pool = queue.Queue()
     
     def init_database(self):
         """Initialize database tables."""
-        self.conn = sqlite3.connect(self.db_path)
+        # isolation_level=None: transactions are only opened explicitly
+        self.conn = sqlite3.connect(
+            self.db_path, isolation_level=None, cached_statements=256, check_same_thread=False
+        )
         self.conn.row_factory = sqlite3.Row
         
         cursor = self.conn.cursor()
+        if self.db_path != ":memory:":
+            cursor.executescript(_FILE_PRAGMAS)
+        cursor.executescript(_PRAGMAS)
+        
+        self.conn.execute("BEGIN IMMEDIATE")
         
         # Plans table
         cursor.execute("""
@@ -62,152 +142,260 @@ class DatabaseManager:
             )
         """)
         
-        # Conversations table
+        # Conversations table; keyed newest first so history reads are a
+        # prefix scan of the primary key
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS conversations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                id INTEGER NOT NULL,
                 role TEXT NOT NULL,
                 content TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+                PRIMARY KEY (created_at DESC, id DESC)
+            ) WITHOUT ROWID
         """)
         
-        self.conn.commit()
+        # Indexes for the per-plan lookups and newest-first listings
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_plan ON tasks(plan_id, priority)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_exec_task ON executions(task_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_plans_created ON plans(created_at DESC)")
+        
+        self.conn.execute("COMMIT")
+    
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection to the database file."""
+        # as_uri() percent-encodes characters such as "#" and "?" that would
+        # otherwise end the path part of the URI
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, cached_statements=256, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_PRAGMAS)
+        with self._pool_lock:
+            self._readers.append(conn)
+        return conn
+    
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for a read.
+        
+        Under WAL, pooled readers run alongside the writer but only see
+        committed data. The thread with an open write transaction reads
+        through the writer connection instead, as on an in-memory database.
+        """
+        if (
+            self._read_pool is None
+            or (self.conn.in_transaction and self._tx_owner == threading.get_ident())
+        ):
+            with self._write_lock:
+                yield self.conn
+            return
+        
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._readers_open < self._max_readers
+                if can_open:
+                    self._readers_open += 1
+            conn = self._open_reader() if can_open else self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+    
+    def _begin_write(self):
+        """Open a transaction for a write made with autocommit disabled."""
+        if not self.autocommit and not self.conn.in_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._tx_owner = threading.get_ident()
+    
+    def commit(self):
+        """Commit writes left pending with autocommit disabled."""
+        with self._write_lock:
+            if self.conn.in_transaction and not self._tx_depth:
+                self.conn.execute("COMMIT")
+    
+    @contextmanager
+    def transaction(self) -> Iterator["DatabaseManager"]:
+        """
+        Group several writes into one transaction.
+        
+        Commits when the outermost block exits and rolls back if it raises;
+        nested blocks, and writes pending with autocommit disabled, join the
+        enclosing transaction.
+        """
+        with self._write_lock:
+            if not self._tx_depth and not self.conn.in_transaction:
+                # IMMEDIATE takes the write lock up front instead of upgrading later
+                self.conn.execute("BEGIN IMMEDIATE")
+                self._tx_owner = threading.get_ident()
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if self._tx_depth == 1:
+                    self.conn.execute("ROLLBACK")
+                raise
+            else:
+                if self._tx_depth == 1:
+                    self.conn.execute("COMMIT")
+            finally:
+                self._tx_depth -= 1
     
     def save_plan(self, goal: str) -> int:
         """Save a plan to the database."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO plans (goal) VALUES (?)",
-            (goal,)
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+        with self._write_lock:
+            self._begin_write()
+            return self.conn.execute(_INSERT_PLAN, (goal,)).lastrowid
     
     def save_task(self, plan_id: int, task_id: int, description: str, priority: int = 0) -> int:
         """Save a task to the database."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO tasks (plan_id, task_id, description, priority) VALUES (?, ?, ?, ?)",
-            (plan_id, task_id, description, priority)
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+        with self._write_lock:
+            self._begin_write()
+            return self.conn.execute(_INSERT_TASK, (plan_id, task_id, description, priority)).lastrowid
+    
+    def save_tasks_bulk(self, plan_id: int, tasks: List[Any]) -> List[int]:
+        """
+        Save many tasks with a single statement and commit.
+        
+        Args:
+            plan_id: Plan the tasks belong to
+            tasks: Objects with id, description and priority attributes
+            
+        Returns:
+            Database ids of the saved tasks, in the order given
+        """
+        rows = [(plan_id, task.id, task.description, task.priority) for task in tasks]
+        if not rows:
+            return []
+        
+        with self.transaction():
+            self.conn.executemany(_INSERT_TASK, rows)
+            # Rows inserted by one statement inside one write transaction get consecutive ids
+            last_id = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
     
     def update_task(self, task_db_id: int, completed: bool, result: str = None):
         """Update a task's completion status."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "UPDATE tasks SET completed = ?, result = ? WHERE id = ?",
-            (completed, result, task_db_id)
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self._begin_write()
+            self.conn.execute(_UPDATE_TASK, (completed, result, task_db_id))
     
     def save_execution(self, task_db_id: int, response: str, duration: float = None):
         """Save task execution record."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO executions (task_id, response, duration_seconds) VALUES (?, ?, ?)",
-            (task_db_id, response, duration)
-        )
-        self.conn.commit()
-        return cursor.lastrowid
+        with self._write_lock:
+            self._begin_write()
+            return self.conn.execute(_INSERT_EXECUTION, (task_db_id, response, duration)).lastrowid
     
     def save_conversation(self, role: str, content: str):
         """Save a conversation message."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "INSERT INTO conversations (role, content) VALUES (?, ?)",
-            (role, content)
-        )
-        self.conn.commit()
+        with self._write_lock:
+            self._begin_write()
+            self.conn.execute(_INSERT_CONVERSATION, (next(self._conversation_ids), role, content))
+    
+    def _fetch_dicts(self, sql: str, params: tuple, columns: tuple) -> List[Dict[str, Any]]:
+        """Run a read and return its rows as dicts keyed by columns."""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            return [dict(zip(columns, row)) for row in cursor.execute(sql, params)]
     
     def get_plan(self, plan_id: int) -> Optional[Dict[str, Any]]:
         """Retrieve a plan by ID."""
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM plans WHERE id = ?", (plan_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+        rows = self._fetch_dicts(_SELECT_PLAN, (plan_id,), _PLAN_COLS)
+        return rows[0] if rows else None
     
     def get_plan_tasks(self, plan_id: int) -> List[Dict[str, Any]]:
         """Get all tasks for a plan."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT * FROM tasks WHERE plan_id = ? ORDER BY priority",
-            (plan_id,)
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        return self._fetch_dicts(_SELECT_PLAN_TASKS, (plan_id,), _TASK_COLS)
     
     def get_all_plans(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent plans."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT * FROM plans ORDER BY created_at DESC LIMIT ?",
-            (limit,)
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        return self._fetch_dicts(_SELECT_RECENT_PLANS, (limit,), _PLAN_COLS)
     
     def get_conversation_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get conversation history."""
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT role, content, created_at FROM conversations ORDER BY created_at DESC LIMIT ?",
-            (limit,)
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        return self._fetch_dicts(_SELECT_CONVERSATION, (limit,), _CONVERSATION_COLS)
+    
+    def _count(self, sql: str, params: tuple = ()) -> int:
+        with self._reader() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+    
+    def count_plans(self, status: Optional[str] = None) -> int:
+        """Count plans, optionally only those with the given status."""
+        if status is None:
+            return self._count(_COUNT_PLANS)
+        return self._count(_COUNT_PLANS_BY_STATUS, (status,))
+    
+    def count_messages(self) -> int:
+        """Count stored conversation messages."""
+        return self._count(_COUNT_CONVERSATION)
     
     def get_plan_statistics(self, plan_id: int) -> Dict[str, Any]:
         """Get statistics for a plan."""
-        cursor = self.conn.cursor()
-        
-        # Get plan info
-        cursor.execute("SELECT * FROM plans WHERE id = ?", (plan_id,))
-        plan = dict(cursor.fetchone())
-        
-        # Get task counts
-        cursor.execute(
-            "SELECT COUNT(*) as total, SUM(completed) as completed FROM tasks WHERE plan_id = ?",
-            (plan_id,)
-        )
-        task_stats = dict(cursor.fetchone())
-        
-        # Get execution count
-        cursor.execute(
-            "SELECT COUNT(*) as total_executions FROM executions WHERE task_id IN (SELECT id FROM tasks WHERE plan_id = ?)",
-            (plan_id,)
-        )
-        exec_stats = dict(cursor.fetchone())
+        # One statement; executions are counted per task first so the task
+        # sums are not multiplied by the execution join
+        with self._reader() as conn:
+            row = conn.execute(
+                """
+                SELECT p.id, p.goal, p.created_at, p.status,
+                       COUNT(t.id) AS total_tasks,
+                       COALESCE(SUM(t.completed), 0) AS completed_tasks,
+                       COALESCE(SUM(t.executions), 0) AS total_executions
+                FROM plans p
+                LEFT JOIN (
+                    SELECT tasks.id, tasks.plan_id, tasks.completed, COUNT(e.id) AS executions
+                    FROM tasks
+                    LEFT JOIN executions e ON e.task_id = tasks.id
+                    WHERE tasks.plan_id = ?
+                    GROUP BY tasks.id
+                ) t ON t.plan_id = p.id
+                WHERE p.id = ?
+                GROUP BY p.id
+                """,
+                (plan_id, plan_id)
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Plan not found: {plan_id}")
         
         return {
-            "plan": plan,
-            "total_tasks": task_stats["total"],
-            "completed_tasks": task_stats["completed"],
-            "total_executions": exec_stats["total_executions"],
+            "plan": {
+                "id": row["id"],
+                "goal": row["goal"],
+                "created_at": row["created_at"],
+                "status": row["status"],
+            },
+            "total_tasks": row["total_tasks"],
+            "completed_tasks": row["completed_tasks"],
+            "total_executions": row["total_executions"],
         }
     
     def close(self):
-        """Close database connection."""
+        """Close database connections."""
+        if self._read_pool is not None:
+            with self._pool_lock:
+                readers, self._readers = self._readers, []
+                self._readers_open = 0
+                self._read_pool = queue.Queue()
+            for conn in readers:
+                conn.close()
         if self.conn:
             self.conn.close()
     
     def clear_all(self):
         """Clear all tables (for testing)."""
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM conversations")
-        cursor.execute("DELETE FROM executions")
-        cursor.execute("DELETE FROM tasks")
-        cursor.execute("DELETE FROM plans")
-        self.conn.commit()
+        with self.transaction():
+            cursor = self.conn.cursor()
+            cursor.execute("DELETE FROM conversations")
+            cursor.execute("DELETE FROM executions")
+            cursor.execute("DELETE FROM tasks")
+            cursor.execute("DELETE FROM plans")
 
 
 class PersistentPlanner:
     """Planner with persistence."""
     
     def __init__(self, llm, db_manager: DatabaseManager):
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-        from agent.planner import Planner
         self.planner = Planner(llm)
         self.db = db_manager
         self.current_plan_id = None
@@ -219,16 +407,11 @@ class PersistentPlanner:
         tasks = self.planner.plan(goal)
         
         # Save to database
-        self.current_plan_id = self.db.save_plan(goal)
+        with self.db.transaction():
+            self.current_plan_id = self.db.save_plan(goal)
+            db_ids = self.db.save_tasks_bulk(self.current_plan_id, tasks)
         
-        for task in tasks:
-            db_id = self.db.save_task(
-                self.current_plan_id,
-                task.id,
-                task.description,
-                task.priority
-            )
-            self.task_db_map[task.id] = db_id
+        self.task_db_map.update(zip((task.id for task in tasks), db_ids))
         
         return tasks
     
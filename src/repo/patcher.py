@@ -4,7 +4,7 @@ Handles reading, modifying, and writing files safely.
 """
 
 import os
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from pathlib import Path
 
 
@@ -27,6 +27,22 @@ class Patcher:
         Returns:
             Success status
         """
+        return self.try_apply_patch(file_path, new_content, backup)[0]
+    
+    def try_apply_patch(
+        self, file_path: str, new_content: str, backup: bool = True
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Apply a patch like apply_patch, also reporting why it failed.
+        
+        Args:
+            file_path: Relative path to file
+            new_content: New file content
+            backup: Whether to create a backup
+            
+        Returns:
+            Tuple of (success, error message or None)
+        """
         full_path = os.path.join(self.repo_path, file_path)
         
         try:
@@ -51,7 +67,7 @@ class Patcher:
                 "status": "success",
             })
             
-            return True
+            return True, None
         except Exception as e:
             self.change_history.append({
                 "file": file_path,
@@ -59,7 +75,7 @@ class Patcher:
                 "status": "failed",
                 "error": str(e),
             })
-            return False
+            return False, str(e)
     
     def apply_diff(self, file_path: str, old_text: str, new_text: str) -> bool:
         """
@@ -4,8 +4,38 @@ Scans and catalogs repository structure and content.
 """
 
 import os
-from typing import List, Dict, Any
-from pathlib import Path
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+def count_lines(file_path: str) -> int:
+    """
+    Count the lines in a file by scanning raw bytes for newlines.
+    
+    A final line without a trailing newline is counted, matching readlines().
+    Unreadable files and binaries, detected by a NUL byte in the first
+    block, count as 0.
+    """
+    count = 0
+    last = b""
+    try:
+        with open(file_path, "rb", buffering=0) as f:
+            read = f.read
+            block = read(1 << 20)
+            if b"\0" in block:
+                return 0
+            while block:
+                count += block.count(b"\n")
+                last = block
+                block = read(1 << 20)
+    except OSError:
+        return 0
+    if last and not last.endswith(b"\n"):
+        count += 1
+    return count
 
 
 class RepositoryInfo:
@@ -17,18 +47,49 @@ class RepositoryInfo:
         self.file_count = 0
         self.total_lines = 0
         self.languages: Dict[str, int] = {}
+        # Relative file paths keyed by extension, built during the scan
+        self.files_by_ext: Dict[str, List[str]] = {}
 
 
 class Scanner:
     """Scans and analyzes repository structure."""
     
-    def __init__(self, repo_path: str, ignore_dirs: List[str] = None):
+    DEFAULT_IGNORE_DIRS = frozenset({
+        ".git", "__pycache__", "node_modules", ".venv", "venv", "dist", "build",
+        ".pytest_cache", ".mypy_cache", ".egg-info"
+    })
+    
+    # Common binary formats are never opened; any other file is counted
+    # unless count_lines finds a NUL byte in it
+    BINARY_EXTENSIONS = frozenset({
+        ".png", ".jpg", ".jpeg", ".gif", ".bmp", ".ico", ".webp", ".pdf", ".zip", ".gz",
+        ".tgz", ".bz2", ".xz", ".7z", ".tar", ".jar", ".whl", ".pyc", ".pyo", ".so",
+        ".dll", ".dylib", ".exe", ".bin", ".o", ".a", ".class", ".db", ".sqlite",
+        ".woff", ".woff2", ".ttf", ".otf", ".mp3", ".mp4", ".wav", ".mov", ".avi"
+    })
+    
+    # Line counting is I/O bound, so threads overlap the reads
+    LINE_COUNT_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+    
+    # Results of recent scans, shared by every Scanner in the process and
+    # keyed by (real repo path, max_depth, ignore_dirs). Nothing is written
+    # into the scanned tree.
+    CACHE_SIZE = 16
+    _scan_cache: "OrderedDict[Tuple[Any, ...], Tuple[Any, RepositoryInfo]]" = OrderedDict()
+    _scan_cache_lock = threading.Lock()
+    
+    def __init__(self, repo_path: str, ignore_dirs: Iterable[str] = None, use_cache: bool = False):
         self.repo_path = repo_path
-        self.ignore_dirs = ignore_dirs or [
-            ".git", "__pycache__", "node_modules", ".venv", "venv", "dist", "build",
-            ".pytest_cache", ".mypy_cache", ".egg-info"
-        ]
+        # Reuse an earlier scan of the same tree while tree_stamp() is unchanged
+        self.use_cache = use_cache
+        # A set keeps the per-entry membership check O(1)
+        self.ignore_dirs = frozenset(ignore_dirs or self.DEFAULT_IGNORE_DIRS)
+        # Entry paths all start with repo_path plus a separator; slicing that
+        # off is cheaper than os.path.relpath
+        self._repo_path_len = len(os.path.join(repo_path, ""))
         self.repo_info = RepositoryInfo()
+        # Files whose lines are counted once the walk finishes
+        self._pending_counts: List[str] = []
     
     def scan_repository(self, max_depth: int = 10) -> str:
         """
@@ -40,47 +101,125 @@ class Scanner:
         Returns:
             Formatted string describing the repository
         """
+        stamp = self.tree_stamp(max_depth) if self.use_cache else None
+        if stamp is not None:
+            key = (os.path.realpath(self.repo_path), max_depth, self.ignore_dirs)
+            with self._scan_cache_lock:
+                cached = self._scan_cache.get(key)
+                if cached is not None and cached[0] == stamp:
+                    self._scan_cache.move_to_end(key)
+                    # Shared with the cache; scans replace repo_info rather than mutate it
+                    self.repo_info = cached[1]
+                    return self._format_summary()
+        
         self.repo_info = RepositoryInfo()
+        self._pending_counts = []
         self._scan_directory(self.repo_path, 0, max_depth)
+        self._count_pending_lines()
+        
+        if stamp is not None:
+            with self._scan_cache_lock:
+                self._scan_cache[key] = (stamp, self.repo_info)
+                self._scan_cache.move_to_end(key)
+                while len(self._scan_cache) > self.CACHE_SIZE:
+                    self._scan_cache.popitem(last=False)
         return self._format_summary()
     
-    def _scan_directory(self, path: str, depth: int, max_depth: int):
-        """Recursively scan directory."""
-        if depth > max_depth:
-            return
+    def tree_stamp(self, max_depth: int = 10) -> Any:
+        """
+        Cheap fingerprint of the tree a scan would visit.
         
+        Stats every directory and file the walk would reach, without reading
+        any content, and returns their newest mtime and their count. Editing,
+        adding, removing or renaming anything at any depth changes it.
+        Returns None if the repository root cannot be read.
+        """
         try:
-            for entry in os.listdir(path):
-                if entry.startswith("."):
-                    continue
-                
-                full_path = os.path.join(path, entry)
-                rel_path = os.path.relpath(full_path, self.repo_path)
-                
-                if os.path.isdir(full_path):
-                    if entry not in self.ignore_dirs:
-                        self.repo_info.directories.append(rel_path)
-                        self._scan_directory(full_path, depth + 1, max_depth)
-                else:
-                    self.repo_info.files.append(rel_path)
-                    self.repo_info.file_count += 1
-                    self._count_lines(full_path, entry)
-        except PermissionError:
-            pass
+            newest = os.stat(self.repo_path).st_mtime_ns
+        except OSError:
+            return None
+        count = 0
+        ignore_dirs = self.ignore_dirs
+        stack = [(self.repo_path, 0)]
+        while stack:
+            current, level = stack.pop()
+            if level > max_depth:
+                continue
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if is_dir and entry.name in ignore_dirs:
+                            continue
+                        mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                        if mtime > newest:
+                            newest = mtime
+                        count += 1
+                        if is_dir:
+                            stack.append((entry.path, level + 1))
+            except OSError:
+                continue
+        return newest, count
     
-    def _count_lines(self, file_path: str, filename: str):
-        """Count lines and detect language."""
-        try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = len(f.readlines())
-                self.repo_info.total_lines += lines
+    def _scan_directory(self, path: str, depth: int, max_depth: int):
+        """Walk the tree below path, using an explicit stack instead of recursion."""
+        stack = [(path, depth)]
+        prefix_len = self._repo_path_len
+        ignore_dirs = self.ignore_dirs
+        while stack:
+            current, level = stack.pop()
+            if level > max_depth:
+                continue
             
-            # Detect language by extension
-            ext = Path(filename).suffix
-            if ext:
-                self.repo_info.languages[ext] = self.repo_info.languages.get(ext, 0) + 1
-        except:
-            pass
+            subdirs = []
+            try:
+                # DirEntry.is_dir() answers from the directory listing, without a stat per entry
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.name.startswith("."):
+                            continue
+                        
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in ignore_dirs:
+                                self.repo_info.directories.append(entry.path[prefix_len:])
+                                subdirs.append((entry.path, level + 1))
+                        elif not entry.is_dir():
+                            # Symlinked directories are skipped rather than followed
+                            rel_path = entry.path[prefix_len:]
+                            self.repo_info.files.append(rel_path)
+                            self.repo_info.file_count += 1
+                            self._index_file(entry.path, rel_path, entry.name)
+            except OSError:
+                continue
+            
+            # Reversed so subdirectories are visited in listing order
+            stack.extend(reversed(subdirs))
+    
+    def _index_file(self, file_path: str, rel_path: str, filename: str):
+        """Index the file by extension, detect language and queue it for line counting."""
+        ext = os.path.splitext(filename)[1]
+        if ext:
+            self.repo_info.languages[ext] = self.repo_info.languages.get(ext, 0) + 1
+            self.repo_info.files_by_ext.setdefault(ext, []).append(rel_path)
+        
+        if ext.lower() in self.BINARY_EXTENSIONS:
+            return
+        
+        self._pending_counts.append(file_path)
+    
+    def _count_pending_lines(self):
+        """Count lines of the files queued during the walk."""
+        paths = self._pending_counts
+        self._pending_counts = []
+        if len(paths) < 2 * self.LINE_COUNT_WORKERS:
+            # Not worth starting threads for a small tree
+            self.repo_info.total_lines += sum(map(count_lines, paths))
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.LINE_COUNT_WORKERS) as pool:
+            self.repo_info.total_lines += sum(pool.map(count_lines, paths))
     
     def _format_summary(self) -> str:
         """Format repository information as a string."""
@@ -104,7 +243,16 @@ class Scanner:
         return summary
     
     def get_files_by_extension(self, extension: str) -> List[str]:
-        """Get all files with a specific extension."""
+        """
+        Get all files with a specific extension.
+        
+        A plain extension such as ".py" or "*.py" is answered from the index
+        built during the scan; the returned list is shared and must not be
+        mutated. Any other suffix falls back to filtering every file.
+        """
+        extension = extension.lstrip("*")
+        if extension.startswith(".") and extension.count(".") == 1:
+            return self.repo_info.files_by_ext.get(extension, [])
         return [f for f in self.repo_info.files if f.endswith(extension)]
     
     def get_file_content(self, file_path: str, max_lines: int = 100) -> str:
@@ -125,12 +273,17 @@ class Scanner:
         
         try:
             with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-                if len(lines) > max_lines:
-                    content = "".join(lines[:max_lines])
-                    content += f"\n... ({len(lines) - max_lines} more lines)\n"
-                else:
-                    content = "".join(lines)
+                content = "".join(islice(f, max_lines))
+                # The rest is only counted, a block at a time, never held as lines
+                remaining = 0
+                last = ""
+                for block in iter(lambda: f.read(1 << 20), ""):
+                    remaining += block.count("\n")
+                    last = block
+                if last and not last.endswith("\n"):
+                    remaining += 1
+            if remaining:
+                content += f"\n... ({remaining} more lines)\n"
             return content
         except Exception as e:
             return f"Error reading file: {e}"
@@ -3,13 +3,19 @@ Unit tests for the AI Agent framework.
 Tests core components: planner, executor, scanner, patcher, and history.
 """
 
+import asyncio
 import unittest
+from unittest import mock
 import tempfile
 import os
+import subprocess
 import sys
+import time
 from pathlib import Path
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+if _SRC_DIR not in sys.path:
+    sys.path.insert(0, _SRC_DIR)
 
 from agent.planner import Planner, Task
 from agent.executor import Executor
@@ -17,6 +23,9 @@ from agent.history import ConversationHistory
 from repo.scanner import Scanner
 from repo.patcher import Patcher
 from llm.mock import MockLLM
+from llm.cache import LLMCache
+from persistence import DatabaseManager
+from advanced_pro import AdvancedAnalytics, DistributedTracing, LatencySketch, RateLimiter, SpanBucket
 
 
 class TestTask(unittest.TestCase):
@@ -43,6 +52,16 @@ class TestTask(unittest.TestCase):
         self.assertEqual(task_dict["id"], 1)
         self.assertEqual(task_dict["description"], "Test task")
         self.assertEqual(task_dict["priority"], 3)
+    
+    def test_task_to_dict_reflects_updates(self):
+        """Test the serialized task is refreshed after a change."""
+        task = Task(1, "Test task")
+        self.assertFalse(task.to_dict()["completed"])
+        
+        task.completed = True
+        task.result = "done"
+        self.assertTrue(task.to_dict()["completed"])
+        self.assertEqual(task.to_dict()["result"], "done")
 
 
 class TestPlanner(unittest.TestCase):
@@ -74,6 +93,20 @@ class TestPlanner(unittest.TestCase):
         self.assertIsNotNone(next_task)
         self.assertFalse(next_task.completed)
     
+    def test_get_next_task_respects_dependencies(self):
+        """Test that a task only becomes ready after its dependencies."""
+        self.planner._add_task(Task(1, "First"))
+        self.planner._add_task(Task(2, "Second", dependencies=[3]))
+        self.planner._add_task(Task(3, "Third", dependencies=[1]))
+        
+        self.assertEqual(self.planner.get_next_task().id, 1)
+        self.planner.mark_task_complete(1)
+        self.assertEqual(self.planner.get_next_task().id, 3)
+        self.planner.mark_task_complete(3)
+        self.assertEqual(self.planner.get_next_task().id, 2)
+        self.planner.mark_task_complete(2)
+        self.assertIsNone(self.planner.get_next_task())
+    
     def test_mark_task_complete(self):
         """Test marking tasks as complete."""
         tasks = self.planner.plan("Test goal")
@@ -83,6 +116,15 @@ class TestPlanner(unittest.TestCase):
         self.assertTrue(self.planner.tasks[task_id].completed)
         self.assertEqual(self.planner.tasks[task_id].result, "Completed")
     
+    def test_parse_multi_digit_numbering(self):
+        """Test stripping numbering with two or more digits."""
+        tasks = self.planner._parse_tasks("9. Ninth step\n10) Tenth step\n11: Eleventh step")
+        
+        self.assertEqual(
+            [t.description for t in tasks],
+            ["Ninth step", "Tenth step", "Eleventh step"],
+        )
+    
     def test_plan_summary(self):
         """Test getting plan summary."""
         self.planner.plan("Test goal")
@@ -122,6 +164,14 @@ class TestConversationHistory(unittest.TestCase):
         
         self.assertLessEqual(len(history.messages), 5)
     
+    def test_extend(self):
+        """Test adding several messages at once."""
+        history = ConversationHistory(max_messages=3)
+        history.extend([("user", "a"), ("assistant", "b"), ("user", "c"), ("assistant", "d")])
+        
+        messages = history.get_messages()
+        self.assertEqual([m["content"] for m in messages], ["b", "c", "d"])
+    
     def test_clear_history(self):
         """Test clearing history."""
         self.history.add_message("user", "Test")
@@ -137,6 +187,19 @@ class TestConversationHistory(unittest.TestCase):
         self.assertEqual(summary["total_messages"], 2)
         self.assertEqual(summary["user_messages"], 1)
         self.assertEqual(summary["assistant_messages"], 1)
+    
+    def test_summary_counts_follow_eviction(self):
+        """Test role counts drop as old messages are evicted."""
+        history = ConversationHistory(max_messages=3)
+        history.add_message("user", "a")
+        history.extend([("assistant", "b"), ("assistant", "c"), ("assistant", "d")])
+        
+        summary = history.get_summary()
+        self.assertEqual(summary["user_messages"], 0)
+        self.assertEqual(summary["assistant_messages"], 3)
+        
+        history.clear()
+        self.assertEqual(history.get_summary()["assistant_messages"], 0)
 
 
 class TestScanner(unittest.TestCase):
@@ -189,6 +252,69 @@ class TestScanner(unittest.TestCase):
         py_files = self.scanner.get_files_by_extension(".py")
         
         self.assertEqual(len(py_files), 1)
+    
+    def test_files_by_extension_refreshed_on_rescan(self):
+        """Test cached extension lookups are dropped by a new scan."""
+        with open(os.path.join(self.temp_dir, "a.py"), "w") as f:
+            f.write("code")
+        
+        self.scanner.scan_repository()
+        self.assertEqual(self.scanner.get_files_by_extension(".py"), ["a.py"])
+        
+        with open(os.path.join(self.temp_dir, "b.py"), "w") as f:
+            f.write("code")
+        
+        self.scanner.scan_repository()
+        self.assertEqual(sorted(self.scanner.get_files_by_extension(".py")), ["a.py", "b.py"])
+        self.assertEqual(sorted(self.scanner.get_files_by_extension("*.py")), ["a.py", "b.py"])
+        self.assertEqual(self.scanner.get_files_by_extension(".md"), [])
+    
+    def test_line_count_skips_binaries(self):
+        """Test lines are counted like readlines() and binaries are skipped."""
+        with open(os.path.join(self.temp_dir, "a.py"), "w") as f:
+            f.write("one\ntwo\nthree")
+        with open(os.path.join(self.temp_dir, "image.png"), "wb") as f:
+            f.write(b"\x89PNG\n\n\n")
+        with open(os.path.join(self.temp_dir, "blob.dat"), "wb") as f:
+            f.write(b"\x00\x01\n\n")
+        with open(os.path.join(self.temp_dir, "App.vue"), "w") as f:
+            f.write("<template>\n</template>\n")
+        
+        self.scanner.scan_repository()
+        self.assertEqual(self.scanner.repo_info.total_lines, 5)
+        self.assertEqual(self.scanner.repo_info.languages[".png"], 1)
+    
+    def test_get_file_content_truncates(self):
+        """Test long files are cut at max_lines with a count of the rest."""
+        with open(os.path.join(self.temp_dir, "long.txt"), "w") as f:
+            f.write("".join(f"line {i}\n" for i in range(10)) + "tail")
+        
+        content = self.scanner.get_file_content("long.txt", max_lines=3)
+        self.assertTrue(content.startswith("line 0\nline 1\nline 2\n"))
+        self.assertIn("... (8 more lines)", content)
+        self.assertNotIn("more lines", self.scanner.get_file_content("long.txt", max_lines=11))
+    
+    def test_scan_cache_reused_until_tree_changes(self):
+        """Test the cached scan is reused and dropped when anything in the tree changes."""
+        os.mkdir(os.path.join(self.temp_dir, "pkg"))
+        module = os.path.join(self.temp_dir, "pkg", "a.py")
+        with open(module, "w") as f:
+            f.write("one\n")
+        
+        first = Scanner(self.temp_dir, use_cache=True).scan_repository()
+        self.assertEqual(os.listdir(self.temp_dir), ["pkg"])
+        
+        cached = Scanner(self.temp_dir, use_cache=True)
+        cached._scan_directory = None  # a cache hit never walks the tree
+        self.assertEqual(cached.scan_repository(), first)
+        self.assertEqual(cached.repo_info.files, [os.path.join("pkg", "a.py")])
+        
+        with open(module, "a") as f:
+            f.write("two\n")
+        stat = os.stat(module)
+        os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        
+        self.assertIn("Total Lines: 2", Scanner(self.temp_dir, use_cache=True).scan_repository())
 
 
 class TestPatcher(unittest.TestCase):
@@ -236,6 +362,18 @@ class TestPatcher(unittest.TestCase):
         with open(full_path, "r") as f:
             self.assertEqual(f.read(), new_content)
     
+    def test_try_apply_patch_reports_error(self):
+        """Test the non-raising patch variant returns the failure reason."""
+        os.makedirs(os.path.join(self.temp_dir, "subdir"))
+        
+        ok, error = self.patcher.try_apply_patch("subdir", "content", backup=False)
+        self.assertFalse(ok)
+        self.assertIsNotNone(error)
+        
+        ok, error = self.patcher.try_apply_patch("new.txt", "content")
+        self.assertTrue(ok)
+        self.assertIsNone(error)
+    
     def test_apply_diff(self):
         """Test applying a diff."""
         file_path = "test.py"
@@ -306,6 +444,68 @@ class TestExecutor(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertGreater(len(result), 0)
     
+    def test_repo_scan_cached_between_tasks(self):
+        """Test the repository is not rescanned when it has not changed."""
+        calls = []
+        scan = self.executor.scanner.scan_repository
+        self.executor.scanner.scan_repository = lambda: calls.append(1) or scan()
+        
+        self.executor.execute_task(Task(1, "First task"))
+        self.executor.execute_task(Task(2, "Second task"))
+        self.assertEqual(len(calls), 1)
+        
+        self.executor.invalidate_repo_cache()
+        self.executor.execute_task(Task(3, "Third task"))
+        self.assertEqual(len(calls), 2)
+    
+    def test_repo_rescanned_after_nested_edit(self):
+        """Test a file edited below the top level triggers a rescan."""
+        nested = os.path.join(self.temp_dir, "pkg")
+        os.mkdir(nested)
+        module = os.path.join(nested, "mod.py")
+        with open(module, "w") as f:
+            f.write("one\n")
+        
+        calls = []
+        scan = self.executor.scanner.scan_repository
+        self.executor.scanner.scan_repository = lambda: calls.append(1) or scan()
+        
+        self.executor.execute_task(Task(1, "First task"))
+        with open(module, "a") as f:
+            f.write("two\n")
+        # Make the edit visible even on filesystems with coarse mtimes
+        stat = os.stat(module)
+        os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        
+        self.executor.execute_task(Task(2, "Second task"))
+        self.assertEqual(len(calls), 2)
+    
+    def test_execute_tasks_async_preserves_order(self):
+        """Test concurrent execution returns results in task order."""
+        tasks = [Task(i, f"Task {i}") for i in range(1, 6)]
+        tasks[0].dependencies = [3]
+        results = asyncio.run(self.executor.execute_tasks_async(tasks, max_concurrency=2))
+        
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(isinstance(r, str) for r in results))
+        executed = [entry["task_id"] for entry in self.executor.get_execution_history()]
+        self.assertLess(executed.index(3), executed.index(1))
+    
+    def test_execute_tasks_batch_reports_failures(self):
+        """Test a failing task does not abort the rest of the batch."""
+        completion = self.llm.completion
+        
+        def flaky(messages):
+            if "Broken" in messages[-1]["content"]:
+                raise RuntimeError("provider error")
+            return completion(messages)
+        
+        self.llm.completion = flaky
+        results = self.executor.execute_tasks_batch([Task(1, "Good task"), Task(2, "Broken task")])
+        
+        self.assertIsInstance(results[0], str)
+        self.assertIsInstance(results[1], RuntimeError)
+    
     def test_execution_history(self):
         """Test execution history tracking."""
         task = Task(1, "Test task")
@@ -316,6 +516,337 @@ class TestExecutor(unittest.TestCase):
         self.assertEqual(history[0]["task_id"], 1)
 
 
+class TestLLMCache(unittest.TestCase):
+    """Tests for LLMCache class."""
+    
+    def test_key_depends_on_request(self):
+        """Test cache keys are stable and request-specific."""
+        messages = [{"role": "user", "content": "Hello"}]
+        key = LLMCache.make_key("model", messages, 0.0, 1.0)
+        
+        self.assertEqual(key, LLMCache.make_key("model", list(messages), 0.0, 1.0))
+        self.assertNotEqual(key, LLMCache.make_key("other", messages, 0.0, 1.0))
+        self.assertNotEqual(key, LLMCache.make_key("model", messages, 0.0, 0.9))
+    
+    def test_get_set(self):
+        """Test storing and retrieving completions."""
+        cache = LLMCache()
+        self.assertIsNone(cache.get("missing"))
+        
+        cache.set("key", "response")
+        self.assertEqual(cache.get("key"), "response")
+
+
+class TestDatabaseManager(unittest.TestCase):
+    """Tests for DatabaseManager class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.db = DatabaseManager(":memory:")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.db.close()
+    
+    def test_transaction_commits(self):
+        """Test writes inside a transaction are kept."""
+        with self.db.transaction():
+            plan_id = self.db.save_plan("Goal")
+            self.db.save_task(plan_id, 1, "Task", 0)
+        
+        self.db.conn.rollback()
+        self.assertEqual(self.db.get_plan_statistics(plan_id)["total_tasks"], 1)
+    
+    def test_save_tasks_bulk_returns_row_ids(self):
+        """Test bulk-saved tasks map back to their rows."""
+        plan_id = self.db.save_plan("Goal")
+        self.db.save_task(plan_id, 99, "Existing", 0)
+        tasks = [Task(1, "First", priority=0), Task(2, "Second", priority=1)]
+        
+        db_ids = self.db.save_tasks_bulk(plan_id, tasks)
+        
+        rows = {row["id"]: row["description"] for row in self.db.get_plan_tasks(plan_id)}
+        self.assertEqual([rows[i] for i in db_ids], ["First", "Second"])
+        self.assertEqual(self.db.save_tasks_bulk(plan_id, []), [])
+    
+    def test_autocommit_disabled_defers_writes(self):
+        """Test writes stay pending until commit() when autocommit is off."""
+        self.db.autocommit = False
+        self.db.save_plan("Pending")
+        self.assertTrue(self.db.conn.in_transaction)
+        
+        self.db.commit()
+        self.assertFalse(self.db.conn.in_transaction)
+        self.assertEqual(len(self.db.get_all_plans()), 1)
+    
+    def test_plan_statistics(self):
+        """Test plan statistics count tasks and executions once each."""
+        plan_id = self.db.save_plan("Goal")
+        first = self.db.save_task(plan_id, 1, "First", 0)
+        self.db.save_task(plan_id, 2, "Second", 1)
+        self.db.update_task(first, True, "Done")
+        self.db.save_execution(first, "run 1")
+        self.db.save_execution(first, "run 2")
+        
+        stats = self.db.get_plan_statistics(plan_id)
+        self.assertEqual(stats["plan"]["goal"], "Goal")
+        self.assertEqual(stats["total_tasks"], 2)
+        self.assertEqual(stats["completed_tasks"], 1)
+        self.assertEqual(stats["total_executions"], 2)
+    
+    def test_transaction_rolls_back_on_error(self):
+        """Test a failing transaction leaves no partial writes."""
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction():
+                self.db.save_plan("Goal")
+                with self.db.transaction():
+                    self.db.save_conversation("user", "Hello")
+                raise RuntimeError("boom")
+        
+        self.assertEqual(self.db.get_all_plans(), [])
+        self.assertEqual(self.db.get_conversation_history(), [])
+    
+    def test_counts(self):
+        """Test plan and message counts."""
+        self.db.save_plan("First")
+        done = self.db.save_plan("Second")
+        self.db.conn.execute("UPDATE plans SET status = 'completed' WHERE id = ?", (done,))
+        self.db.save_conversation("user", "Hello")
+        
+        self.assertEqual(self.db.count_plans(), 2)
+        self.assertEqual(self.db.count_plans(status="completed"), 1)
+        self.assertEqual(self.db.count_messages(), 1)
+
+
+class TestDatabaseReaderPool(unittest.TestCase):
+    """Tests for DatabaseManager read connections on a database file."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.temp_dir, "agent.db"), readers=2)
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        import shutil
+        self.db.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_readers_see_committed_writes_only(self):
+        """Test other threads read committed data while a transaction is open."""
+        import threading
+        plan_id = self.db.save_plan("Committed")
+        
+        with self.db.transaction():
+            self.db.save_plan("Pending")
+            # The writing thread sees its own pending write
+            self.assertEqual(len(self.db.get_all_plans()), 2)
+            
+            seen = []
+            reader = threading.Thread(
+                target=lambda: seen.extend(plan["goal"] for plan in self.db.get_all_plans())
+            )
+            reader.start()
+            reader.join()
+            self.assertEqual(seen, ["Committed"])
+        
+        self.assertEqual(len(self.db.get_all_plans()), 2)
+        self.assertEqual(self.db.get_plan(plan_id)["goal"], "Committed")
+        self.assertLessEqual(self.db._readers_open, 2)
+    
+    def test_path_with_uri_characters(self):
+        """Test pooled readers open the right file when the path contains '#' or '?'."""
+        import shutil
+        import threading
+        odd_dir = tempfile.mkdtemp(prefix="db#x?y")
+        try:
+            db = DatabaseManager(os.path.join(odd_dir, "agent.db"), readers=1)
+            db.save_plan("Goal")
+            seen = []
+            reader = threading.Thread(target=lambda: seen.extend(db.get_all_plans()))
+            reader.start()
+            reader.join()
+            db.close()
+            self.assertEqual([plan["goal"] for plan in seen], ["Goal"])
+        finally:
+            shutil.rmtree(odd_dir)
+    
+    def test_close_closes_borrowed_readers(self):
+        """Test close() also closes readers that are checked out."""
+        import sqlite3
+        with self.db._reader() as conn:
+            self.db.close()
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        self.assertEqual(self.db._readers_open, 0)
+    
+    def test_pending_writes_visible_to_writer(self):
+        """Test writes pending with autocommit off are read back by the same thread."""
+        self.db.autocommit = False
+        self.db.save_plan("Pending")
+        self.assertEqual(len(self.db.get_all_plans()), 1)
+        self.db.commit()
+
+
+class TestLatencySketch(unittest.TestCase):
+    """Tests for LatencySketch quantile estimates."""
+    
+    def test_quantiles_within_relative_accuracy(self):
+        """Test p50 and p99 stay within 1% of the exact values."""
+        values = [float(v) for v in range(1, 1001)]
+        sketch = LatencySketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        
+        for q in (0.5, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(q) - exact), 0.01 * exact)
+        self.assertIsNone(LatencySketch().quantile(0.5))
+    
+    def test_merge(self):
+        """Test merging two sketches matches one sketch of all the values."""
+        combined = LatencySketch()
+        low, high = LatencySketch(), LatencySketch()
+        for value in range(0, 500):
+            low.add(value)
+            combined.add(value)
+        for value in range(500, 1000):
+            high.add(value)
+            combined.add(value)
+        
+        low.merge(high)
+        self.assertEqual(low.count, 1000)
+        self.assertEqual(low.zero_count, 1)
+        self.assertEqual(low.bins, combined.bins)
+        self.assertEqual(low.quantile(0.99), combined.quantile(0.99))
+
+
+class TestSpanBuckets(unittest.TestCase):
+    """Tests for DistributedTracing span aggregation."""
+    
+    def test_flush_drops_buckets_past_keep_window(self):
+        """Test flush() removes and returns only buckets older than keep_buckets."""
+        tracing = DistributedTracing("svc", keep_buckets=2)
+        tracing.add_span("trace", "query", 5.0)
+        (key,) = tracing._buckets
+        bucket = key[2]
+        
+        self.assertEqual(tracing.flush((bucket + 1) * DistributedTracing.BUCKET_NS), {})
+        self.assertIn(key, tracing._buckets)
+        
+        expired = tracing.flush((bucket + 2) * DistributedTracing.BUCKET_NS)
+        self.assertEqual(list(expired), [key])
+        self.assertEqual(expired[key].count, 1)
+        self.assertEqual(tracing._buckets, {})
+    
+    def test_span_stats_merge_buckets(self):
+        """Test get_span_stats() combines buckets of the same name and status."""
+        tracing = DistributedTracing("svc", detailed=False)
+        current = time.time_ns() // DistributedTracing.BUCKET_NS
+        for offset, durations in ((0, [10.0, 20.0]), (1, [30.0])):
+            bucket = SpanBucket()
+            for duration in durations:
+                bucket.add(duration)
+            tracing._buckets[("query", "success", current - offset)] = bucket
+        error = SpanBucket()
+        error.add(100.0)
+        tracing._buckets[("query", "error", current)] = error
+        
+        stats = tracing.get_span_stats()
+        self.assertEqual(stats["query:success"]["count"], 3)
+        self.assertAlmostEqual(stats["query:success"]["avg_ms"], 20.0)
+        self.assertLessEqual(abs(stats["query:success"]["p50_ms"] - 20.0), 0.2)
+        self.assertEqual(stats["query:error"]["count"], 1)
+        self.assertEqual(tracing.traces, {})
+
+
+class TestBoundedAnalytics(unittest.TestCase):
+    """Tests for eviction in AdvancedAnalytics and DistributedTracing."""
+    
+    def test_evicted_events_leave_aggregates(self):
+        """Test the oldest events drop out of the insights and user stats."""
+        analytics = AdvancedAnalytics(max_events=3)
+        for event_type, user_id in (("click", "u1"), ("view", "u1"), ("click", "u2"), ("buy", "u2")):
+            analytics.track_event(event_type, user_id, {})
+        
+        insights = analytics.get_insights()
+        self.assertEqual(insights["total_events"], 3)
+        self.assertEqual(insights["unique_users"], 2)
+        self.assertEqual(insights["event_distribution"], {"view": 1, "click": 1, "buy": 1})
+        u1 = analytics.get_user_stats("u1")
+        self.assertEqual(u1["total_events"], 1)
+        self.assertEqual(u1["event_types"], ["view"])
+        
+        analytics.track_event("view", "u2", {})
+        analytics.track_event("view", "u2", {})
+        
+        insights = analytics.get_insights()
+        self.assertEqual(insights["unique_users"], 1)
+        self.assertEqual(insights["event_distribution"], {"buy": 1, "view": 2})
+        self.assertEqual(insights["most_common_event"], "view")
+        self.assertEqual(analytics.get_user_stats("u1")["total_events"], 0)
+        self.assertEqual(sorted(analytics.get_user_stats("u2")["event_types"]), ["buy", "view"])
+    
+    def test_least_recently_used_trace_evicted(self):
+        """Test the trace not touched for longest is dropped past max_traces."""
+        tracing = DistributedTracing("svc", max_traces=2)
+        tracing.start_trace("a")
+        tracing.start_trace("b")
+        tracing.add_span("a", "query", 1.0)
+        tracing.start_trace("c")
+        
+        self.assertEqual(list(tracing.traces), ["a", "c"])
+        self.assertEqual(tracing.get_trace("b"), [])
+        self.assertEqual(len(tracing.get_trace("a")), 1)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Tests for RateLimiter token accounting."""
+    
+    def setUp(self):
+        """Drive the limiter from a fake monotonic clock."""
+        self.now = 1_000_000_000
+        patcher = mock.patch("advanced_pro.time.monotonic_ns", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_burst_then_refusal(self):
+        """Test a full bucket allows `rate` calls, then refuses until refilled."""
+        limiter = RateLimiter(3, period=1)
+        self.assertEqual([limiter.is_allowed() for _ in range(4)], [True, True, True, False])
+        self.assertEqual(limiter.tokens, 0)
+        
+        self.now += 10**9 // 3 + 1
+        self.assertTrue(limiter.is_allowed())
+        self.assertFalse(limiter.is_allowed())
+    
+    def test_fractional_rate(self):
+        """Test a rate of 0.5 per second grants one call every two seconds."""
+        limiter = RateLimiter(0.5, period=1)
+        self.assertEqual(limiter.tokens, 1)
+        self.assertTrue(limiter.is_allowed())
+        self.assertEqual(limiter.tokens, 0)
+        
+        self.now += 10**9
+        self.assertFalse(limiter.is_allowed())
+        self.assertEqual(limiter.tokens, 0.5)
+        
+        self.now += 10**9
+        self.assertTrue(limiter.is_allowed())
+    
+    def test_float_period_keeps_integer_state(self):
+        """Test float arguments still leave the bucket in exact integers."""
+        limiter = RateLimiter(2.5, period=0.5)
+        self.assertIsInstance(limiter._tokens_ns, int)
+        self.assertIsInstance(limiter._token_ns, int)
+        self.assertEqual(limiter.tokens, 2.5)
+        self.assertEqual([limiter.is_allowed() for _ in range(3)], [True, True, False])
+        
+        # 0.5 s at 5 tokens per second refills to the cap again
+        self.now += 5 * 10**8
+        self.assertEqual([limiter.is_allowed() for _ in range(3)], [True, True, False])
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for the full system."""
     
@@ -354,5 +885,31 @@ class TestIntegration(unittest.TestCase):
         self.assertGreater(len(self.executor.get_execution_history()), 0)
 
 
+class TestDemoScript(unittest.TestCase):
+    """Smoke tests for scripts/demo.py."""
+    
+    DEMO = os.path.join(os.path.dirname(_SRC_DIR), "scripts", "demo.py")
+    
+    def _run(self, *args, **kwargs):
+        env = dict(os.environ)
+        env.pop("AGENT_AI_DEMO_AUTO", None)
+        return subprocess.run(
+            [sys.executable, self.DEMO, *args],
+            capture_output=True, text=True, timeout=60, env=env, **kwargs
+        )
+    
+    def test_interactive_mode_pauses_between_demos(self):
+        """Test the default mode waits for Enter between demos and finishes."""
+        result = self._run(input="\n" * 10)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("Press Enter to continue", result.stdout)
+    
+    def test_noninteractive_mode(self):
+        """Test --noninteractive runs straight through."""
+        result = self._run("--noninteractive", stdin=subprocess.DEVNULL)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn("Press Enter to continue", result.stdout)
+
+
 if __name__ == "__main__":
     unittest.main()
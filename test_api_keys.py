@@ -9,6 +9,9 @@ import time
 
 BASE_URL = "http://localhost:8000"
 
+# One session keeps the connection to the server alive across all calls
+session = requests.Session()
+
 print("=" * 70)
 print("🔑 API Key Management Demo")
 print("=" * 70)
@@ -31,7 +34,7 @@ def test_generate_key():
         "metadata": {"environment": "demo", "version": "1.0"}
     }
     
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api-keys/generate",
         json=payload
     )
@@ -56,7 +59,7 @@ def test_list_keys():
     print("\n2️⃣  LIST API KEYS")
     print("-" * 70)
     
-    response = requests.get(f"{BASE_URL}/api-keys/list")
+    response = session.get(f"{BASE_URL}/api-keys/list")
     
     if response.status_code == 200:
         data = response.json()
@@ -78,7 +81,7 @@ def test_validate_key(api_key):
     print("\n3️⃣  VALIDATE API KEY")
     print("-" * 70)
     
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/api-keys/validate",
         params={"api_key": api_key}
     )
@@ -103,7 +106,7 @@ def test_get_key_info(key_id):
     print("\n4️⃣  GET KEY INFORMATION")
     print("-" * 70)
     
-    response = requests.get(f"{BASE_URL}/api-keys/{key_id}")
+    response = session.get(f"{BASE_URL}/api-keys/{key_id}")
     
     if response.status_code == 200:
         data = response.json()
@@ -125,7 +128,7 @@ def test_usage_stats():
     print("\n5️⃣  USAGE STATISTICS")
     print("-" * 70)
     
-    response = requests.get(f"{BASE_URL}/api-keys/stats/usage")
+    response = session.get(f"{BASE_URL}/api-keys/stats/usage")
     
     if response.status_code == 200:
         data = response.json()
@@ -144,7 +147,7 @@ def test_use_key_in_request(api_key):
     print("-" * 70)
     
     headers = {"X-API-Key": api_key}
-    response = requests.get(
+    response = session.get(
         f"{BASE_URL}/health",
         headers=headers
     )
@@ -161,7 +164,7 @@ def test_revoke_key(key_id):
     print("\n7️⃣  REVOKE API KEY")
     print("-" * 70)
     
-    response = requests.post(f"{BASE_URL}/api-keys/{key_id}/revoke")
+    response = session.post(f"{BASE_URL}/api-keys/{key_id}/revoke")
     
     if response.status_code == 200:
         data = response.json()